@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Benchmark comparison between fastpack, json, and pickle.
+Benchmark comparison between typepack, json, and pickle.
 
 Run: python benchmarks/compare.py
 """
@@ -12,7 +12,7 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-import fastpack
+import typepack
 
 
 def benchmark(name: str, func, iterations: int = 10000) -> float:
@@ -61,7 +61,7 @@ def run_benchmarks():
     ]
 
     print("=" * 60)
-    print("FASTPACK BENCHMARK")
+    print("TYPEPACK BENCHMARK")
     print("=" * 60)
     print()
 
@@ -83,23 +83,29 @@ def run_benchmarks():
         pickle_unpack = benchmark("pickle_unpack", lambda: pickle.loads(pickle_packed))
         print(format_result("pickle", pickle_pack, pickle_unpack, len(pickle_packed)))
 
-        # Fastpack
-        fastpack_packed = fastpack.pack(data)
-        fastpack_pack = benchmark("fastpack_pack", lambda: fastpack.pack(data))
-        fastpack_unpack = benchmark("fastpack_unpack", lambda: fastpack.unpack(fastpack_packed))
-        print(format_result("fastpack", fastpack_pack, fastpack_unpack, len(fastpack_packed)))
+        # typepack
+        typepack_packed = typepack.pack(data)
+        typepack_pack = benchmark("typepack_pack", lambda: typepack.pack(data))
+        typepack_unpack = benchmark("typepack_unpack", lambda: typepack.unpack(typepack_packed))
+        print(format_result("typepack", typepack_pack, typepack_unpack, len(typepack_packed)))
+
+        # typepack writing into and reading from the caller's reused buffer
+        scratch = bytearray(len(typepack_packed))
+        into_pack = benchmark("typepack_pack_into", lambda: typepack.pack_into(data, scratch))
+        into_unpack = benchmark("typepack_unpack_from_buffer", lambda: typepack.unpack_from_buffer(scratch))
+        print(format_result("typepack buf", into_pack, into_unpack, len(scratch)))
 
         # Size comparison
         print()
         json_size = len(json_packed)
-        fastpack_size = len(fastpack_packed)
-        reduction = (1 - fastpack_size / json_size) * 100
+        typepack_size = len(typepack_packed)
+        reduction = (1 - typepack_size / json_size) * 100
         print(f"Size reduction vs JSON: {reduction:.1f}%")
         print()
 
-    # Python types (only fastpack supports these natively)
+    # Python types (only typepack supports these natively)
     print("=" * 60)
-    print("PYTHON TYPES (fastpack only)")
+    print("PYTHON TYPES (typepack only)")
     print("=" * 60)
     print()
 
@@ -111,13 +117,13 @@ def run_benchmarks():
         "coords": (10, 20, 30),
     }
 
-    fastpack_packed = fastpack.pack(python_data)
-    fastpack_pack = benchmark("fastpack_pack", lambda: fastpack.pack(python_data))
-    fastpack_unpack = benchmark("fastpack_unpack", lambda: fastpack.unpack(fastpack_packed))
+    typepack_packed = typepack.pack(python_data)
+    typepack_pack = benchmark("typepack_pack", lambda: typepack.pack(python_data))
+    typepack_unpack = benchmark("typepack_unpack", lambda: typepack.unpack(typepack_packed))
 
-    print(f"Pack time:   {fastpack_pack:.2f} µs")
-    print(f"Unpack time: {fastpack_unpack:.2f} µs")
-    print(f"Size:        {len(fastpack_packed)} bytes")
+    print(f"Pack time:   {typepack_pack:.2f} µs")
+    print(f"Unpack time: {typepack_unpack:.2f} µs")
+    print(f"Size:        {len(typepack_packed)} bytes")
     print()
 
     # Streaming benchmark
@@ -129,9 +135,9 @@ def run_benchmarks():
     stream_data = [{"id": i, "value": f"item_{i}"} for i in range(1000)]
 
     # pack_many
-    many_packed = fastpack.pack_many(stream_data)
-    pack_many_time = benchmark("pack_many", lambda: fastpack.pack_many(stream_data), iterations=100)
-    unpack_many_time = benchmark("unpack_many", lambda: fastpack.unpack_many(many_packed), iterations=100)
+    many_packed = typepack.pack_many(stream_data)
+    pack_many_time = benchmark("pack_many", lambda: typepack.pack_many(stream_data), iterations=100)
+    unpack_many_time = benchmark("unpack_many", lambda: typepack.unpack_many(many_packed), iterations=100)
 
     print(f"pack_many:   {pack_many_time:.2f} µs")
     print(f"unpack_many: {unpack_many_time:.2f} µs")
@@ -1,31 +1,114 @@
 """
-Setup script for fastpack C extension.
+Setup script for typepack C extension.
 
 The C extension is optional - if the build fails (no compiler, etc.),
 the package will still work using the pure Python implementation.
+
+Build options (environment variables):
+    TYPEPACK_MARCH  Target CPU for the extension, e.g. "native" for a
+                    source install on the machine that will run it, or
+                    "x86-64-v3" for wheels shared between modern x86 hosts.
+                    Passed as -march=... (or /arch:... with MSVC). Unset
+                    by default so builds stay portable.
+    TYPEPACK_PGO    Set to "1" for a profile-guided build (GCC): build
+                    instrumented, run benchmarks/compare.py, then rebuild
+                    using the recorded profile.
 """
 
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
 from setuptools import setup, Extension
 from setuptools.command.build_ext import build_ext
 
 
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _compile_args() -> list:
+    """Return optimization flags for the current platform."""
+    march = os.environ.get("TYPEPACK_MARCH")
+
+    if sys.platform == "win32":
+        args = ["/O2"]
+        if march:
+            args.append(f"/arch:{march}")
+        return args
+
+    args = ["-O3", "-funroll-loops"]
+    if sys.platform.startswith("linux"):
+        # Call libpython through the GOT instead of PLT stubs
+        args.append("-fno-plt")
+    if march:
+        args.append(f"-march={march}")
+    return args
+
+
 class BuildExtOptional(build_ext):
     """Build C extensions, but don't fail if compilation is not possible."""
 
     def build_extension(self, ext):
         try:
-            super().build_extension(ext)
+            if os.environ.get("TYPEPACK_PGO") == "1" and self.compiler.compiler_type == "unix":
+                self._build_with_pgo(ext)
+            else:
+                super().build_extension(ext)
         except Exception as e:
             print(f"\n*** WARNING: Failed to build C extension: {e}")
             print("*** typepack will use pure Python implementation instead.\n")
 
+    def _build_with_pgo(self, ext):
+        """Two-phase profile-guided build; falls back to a plain build."""
+        compile_args = list(ext.extra_compile_args)
+        link_args = list(ext.extra_link_args)
+        profile_dir = os.path.abspath(os.path.join(self.build_temp, "pgo"))
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        self.force = True
+
+        try:
+            ext.extra_compile_args = compile_args + [f"-fprofile-generate={profile_dir}"]
+            ext.extra_link_args = link_args + [f"-fprofile-generate={profile_dir}"]
+            super().build_extension(ext)
+            self._run_pgo_training(ext)
+
+            ext.extra_compile_args = compile_args + [
+                f"-fprofile-use={profile_dir}",
+                "-fprofile-correction",
+            ]
+            ext.extra_link_args = link_args
+            super().build_extension(ext)
+        except Exception as e:
+            print(f"\n*** WARNING: PGO build failed ({e}); building without profile.\n")
+            ext.extra_compile_args = compile_args
+            ext.extra_link_args = link_args
+            super().build_extension(ext)
+
+    def _run_pgo_training(self, ext):
+        """Run the benchmark against the instrumented extension."""
+        script = os.path.join(HERE, "benchmarks", "compare.py")
+        if not os.path.exists(script):
+            raise RuntimeError("benchmarks/compare.py not found for training")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            package_dir = os.path.join(tmp, "typepack")
+            shutil.copytree(os.path.join(HERE, "typepack"), package_dir)
+            shutil.copy(self.get_ext_fullpath(ext.name), package_dir)
+            env = dict(os.environ, PYTHONPATH=tmp)
+            subprocess.run(
+                [sys.executable, script],
+                check=True,
+                env=env,
+                stdout=subprocess.DEVNULL,
+            )
+
 
 # Define the C extension
 _typepack_ext = Extension(
     "typepack._typepack",
     sources=["src/_typepack.c"],
-    extra_compile_args=["-O3"] if sys.platform != "win32" else ["/O2"],
+    extra_compile_args=_compile_args(),
 )
 
 
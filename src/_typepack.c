@@ -11,6 +11,13 @@
 #include <Python.h>
 #include <stdint.h>
 
+#if defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define HAVE_SSE2 1
+#else
+#define HAVE_SSE2 0
+#endif
+
 /* Check for PyBytesWriter availability (Python 3.15+) */
 #if PY_VERSION_HEX >= 0x030F0000
 #define HAVE_PYBYTESWRITER 1
@@ -67,6 +74,8 @@
 #define EXT_DATACLASS   0x0B
 #define EXT_NAMEDTUPLE  0x0C
 #define EXT_CUSTOM      0x0D
+#define EXT_TABLE       0x0E
+#define EXT_INT_ARRAY   0x0F
 
 /* Helper macros for big-endian encoding */
 #define WRITE_BE16(buf, val) do { \
@@ -92,19 +101,139 @@
     (buf)[7] = (uint8_t)(val); \
 } while(0)
 
-/* Helper macros for big-endian decoding */
-#define READ_BE16(buf) \
-    (((uint16_t)(buf)[0] << 8) | (uint16_t)(buf)[1])
+/*
+ * Big-endian loads. A memcpy of the full width plus a byte swap compiles
+ * to a single load and bswap (or movbe) instead of a shift/or per byte.
+ */
+#if defined(__GNUC__) || defined(__clang__)
+#define TP_BSWAP16(x) __builtin_bswap16(x)
+#define TP_BSWAP32(x) __builtin_bswap32(x)
+#define TP_BSWAP64(x) __builtin_bswap64(x)
+#define TP_HOT __attribute__((hot))
+#elif defined(_MSC_VER)
+#include <stdlib.h>
+#define TP_BSWAP16(x) _byteswap_ushort(x)
+#define TP_BSWAP32(x) _byteswap_ulong(x)
+#define TP_BSWAP64(x) _byteswap_uint64(x)
+#define TP_HOT
+#else
+#define TP_BSWAP16(x) ((uint16_t)(((x) >> 8) | ((x) << 8)))
+#define TP_BSWAP32(x) \
+    ((((x) & 0xFF000000u) >> 24) | (((x) & 0x00FF0000u) >> 8) | \
+     (((x) & 0x0000FF00u) << 8) | (((x) & 0x000000FFu) << 24))
+#define TP_BSWAP64(x) \
+    (((uint64_t)TP_BSWAP32((uint32_t)(x)) << 32) | \
+     (uint64_t)TP_BSWAP32((uint32_t)((x) >> 32)))
+#define TP_HOT
+#endif
+
+static inline uint16_t
+load_be16(const uint8_t *p)
+{
+    uint16_t v;
+    memcpy(&v, p, sizeof(v));
+#if PY_LITTLE_ENDIAN
+    v = TP_BSWAP16(v);
+#endif
+    return v;
+}
+
+static inline uint32_t
+load_be32(const uint8_t *p)
+{
+    uint32_t v;
+    memcpy(&v, p, sizeof(v));
+#if PY_LITTLE_ENDIAN
+    v = TP_BSWAP32(v);
+#endif
+    return v;
+}
+
+static inline uint64_t
+load_be64(const uint8_t *p)
+{
+    uint64_t v;
+    memcpy(&v, p, sizeof(v));
+#if PY_LITTLE_ENDIAN
+    v = TP_BSWAP64(v);
+#endif
+    return v;
+}
+
+
+/*
+ * Return the number of leading bytes in p[0..n) that are positive fixints
+ * (0x00-0x7F). Each such byte is a complete one-byte integer, so a run of
+ * them can be encoded or decoded without per-item dispatch. With SSE2 the
+ * high bits of 16 bytes are tested at once.
+ */
+static Py_ssize_t
+fixint_run(const uint8_t *p, Py_ssize_t n)
+{
+    Py_ssize_t i = 0;
+
+#if HAVE_SSE2
+    for (; i + 16 <= n; i += 16) {
+        __m128i v = _mm_loadu_si128((const __m128i *)(p + i));
+        if (_mm_movemask_epi8(v) != 0) {
+            break;
+        }
+    }
+#endif
+
+    while (i < n && p[i] <= 0x7F) {
+        i++;
+    }
+    return i;
+}
 
-#define READ_BE32(buf) \
-    (((uint32_t)(buf)[0] << 24) | ((uint32_t)(buf)[1] << 16) | \
-     ((uint32_t)(buf)[2] << 8) | (uint32_t)(buf)[3])
 
-#define READ_BE64(buf) \
-    (((uint64_t)(buf)[0] << 56) | ((uint64_t)(buf)[1] << 48) | \
-     ((uint64_t)(buf)[2] << 40) | ((uint64_t)(buf)[3] << 32) | \
-     ((uint64_t)(buf)[4] << 24) | ((uint64_t)(buf)[5] << 16) | \
-     ((uint64_t)(buf)[6] << 8) | (uint64_t)(buf)[7])
+/*
+ * Pure Python implementation (typepack.core), which also covers the
+ * extended types. The entry points below hand an object to it when the
+ * C code cannot take it, so typepack can bind them directly instead of
+ * wrapping them in Python. Looked up on first use and kept.
+ */
+static PyObject *py_pack;
+static PyObject *py_pack_into;
+static PyObject *py_unpack;
+static PyObject *py_unpack_from_buffer;
+
+static PyObject *
+python_impl(PyObject **slot, const char *name)
+{
+    if (*slot == NULL) {
+        PyObject *core_module = PyImport_ImportModule("typepack.core");
+        if (core_module == NULL) {
+            return NULL;
+        }
+        *slot = PyObject_GetAttrString(core_module, name);
+        Py_DECREF(core_module);
+    }
+    return *slot;
+}
+
+/* Call typepack.core.<name> with the argument tuple of an entry point */
+static PyObject *
+call_python_impl(PyObject **slot, const char *name, PyObject *args)
+{
+    PyObject *func = python_impl(slot, name);
+    if (func == NULL) {
+        return NULL;
+    }
+    return PyObject_Call(func, args, NULL);
+}
+
+/* Same, for the single argument of a METH_O entry point */
+static PyObject *
+call_python_impl_o(PyObject **slot, const char *name, PyObject *arg)
+{
+    PyObject *func = python_impl(slot, name);
+    if (func == NULL) {
+        return NULL;
+    }
+    return PyObject_CallOneArg(func, arg);
+}
 
 
 #if HAVE_PYBYTESWRITER
@@ -123,6 +252,59 @@ static int pack_list(PyBytesWriter *writer, PyObject *obj);
 static int pack_dict(PyBytesWriter *writer, PyObject *obj);
 
 
+/*
+ * Encode a str/bin/array/map length header into buf and return its size
+ * (1, 2, 3 or 5 bytes). fix_base/fix_max describe the one-byte "fix" form
+ * (fix_max < 0 when the type has none) and marker8 is 0 when the type has
+ * no 8-bit form. Call sites pass constants, so after inlining this is a
+ * straight compare ladder on size with no per-byte loop.
+ */
+static inline Py_ssize_t
+write_length_header(uint8_t *buf, Py_ssize_t size,
+                    uint8_t fix_base, Py_ssize_t fix_max,
+                    uint8_t marker8, uint8_t marker16, uint8_t marker32)
+{
+    if (size <= fix_max) {
+        buf[0] = fix_base | (uint8_t)size;
+        return 1;
+    }
+    if (marker8 != 0 && size <= 0xFF) {
+        buf[0] = marker8;
+        buf[1] = (uint8_t)size;
+        return 2;
+    }
+    if (size <= 0xFFFF) {
+        buf[0] = marker16;
+        WRITE_BE16(buf + 1, (uint16_t)size);
+        return 3;
+    }
+    buf[0] = marker32;
+    WRITE_BE32(buf + 1, (uint32_t)size);
+    return 5;
+}
+
+
+/*
+ * Append a header and its payload with a single capacity check, instead
+ * of growing the writer once for each part.
+ */
+static int
+write_header_and_data(PyBytesWriter *writer,
+                      const uint8_t *header, Py_ssize_t header_size,
+                      const char *data, Py_ssize_t size)
+{
+    Py_ssize_t pos = PyBytesWriter_GetSize(writer);
+    if (PyBytesWriter_Grow(writer, header_size + size) < 0) {
+        return -1;
+    }
+
+    uint8_t *out = (uint8_t *)PyBytesWriter_GetData(writer) + pos;
+    memcpy(out, header, header_size);
+    memcpy(out + header_size, data, size);
+    return 0;
+}
+
+
 static int
 pack_int(PyBytesWriter *writer, PyObject *obj)
 {
@@ -232,33 +414,10 @@ pack_str(PyBytesWriter *writer, PyObject *obj)
     }
 
     uint8_t header[5];
-    Py_ssize_t header_size;
+    Py_ssize_t header_size = write_length_header(
+        header, size, 0xA0, 31, MP_STR8, MP_STR16, MP_STR32);
 
-    if (size <= 31) {
-        /* Fixstr */
-        header[0] = 0xA0 | (uint8_t)size;
-        header_size = 1;
-    }
-    else if (size <= 0xFF) {
-        header[0] = MP_STR8;
-        header[1] = (uint8_t)size;
-        header_size = 2;
-    }
-    else if (size <= 0xFFFF) {
-        header[0] = MP_STR16;
-        WRITE_BE16(header + 1, (uint16_t)size);
-        header_size = 3;
-    }
-    else {
-        header[0] = MP_STR32;
-        WRITE_BE32(header + 1, (uint32_t)size);
-        header_size = 5;
-    }
-
-    if (PyBytesWriter_WriteBytes(writer, header, header_size) < 0) {
-        return -1;
-    }
-    return PyBytesWriter_WriteBytes(writer, data, size);
+    return write_header_and_data(writer, header, header_size, data, size);
 }
 
 
@@ -269,28 +428,10 @@ pack_bytes(PyBytesWriter *writer, PyObject *obj)
     const char *data = PyBytes_AS_STRING(obj);
 
     uint8_t header[5];
-    Py_ssize_t header_size;
-
-    if (size <= 0xFF) {
-        header[0] = MP_BIN8;
-        header[1] = (uint8_t)size;
-        header_size = 2;
-    }
-    else if (size <= 0xFFFF) {
-        header[0] = MP_BIN16;
-        WRITE_BE16(header + 1, (uint16_t)size);
-        header_size = 3;
-    }
-    else {
-        header[0] = MP_BIN32;
-        WRITE_BE32(header + 1, (uint32_t)size);
-        header_size = 5;
-    }
+    Py_ssize_t header_size = write_length_header(
+        header, size, 0, -1, MP_BIN8, MP_BIN16, MP_BIN32);
 
-    if (PyBytesWriter_WriteBytes(writer, header, header_size) < 0) {
-        return -1;
-    }
-    return PyBytesWriter_WriteBytes(writer, data, size);
+    return write_header_and_data(writer, header, header_size, data, size);
 }
 
 
@@ -299,34 +440,59 @@ pack_list(PyBytesWriter *writer, PyObject *obj)
 {
     Py_ssize_t size = PyList_GET_SIZE(obj);
     uint8_t header[5];
-    Py_ssize_t header_size;
+    Py_ssize_t header_size = write_length_header(
+        header, size, 0x90, 15, 0, MP_ARRAY16, MP_ARRAY32);
 
-    if (size <= 15) {
-        /* Fixarray */
-        header[0] = 0x90 | (uint8_t)size;
-        header_size = 1;
+    if (PyBytesWriter_WriteBytes(writer, header, header_size) < 0) {
+        return -1;
     }
-    else if (size <= 0xFFFF) {
-        header[0] = MP_ARRAY16;
-        WRITE_BE16(header + 1, (uint16_t)size);
-        header_size = 3;
+
+    /* Batch path: write the leading run of ints in 0-127 as one fixint
+     * byte each, straight into the writer; shrink back at the first
+     * item that needs the generic encoder. */
+    Py_ssize_t start = 0;
+    if (size > 0 && PyLong_CheckExact(PyList_GET_ITEM(obj, 0))) {
+        Py_ssize_t pos = PyBytesWriter_GetSize(writer);
+        if (PyBytesWriter_Grow(writer, size) < 0) {
+            return -1;
+        }
+        uint8_t *out = (uint8_t *)PyBytesWriter_GetData(writer) + pos;
+
+        while (start < size) {
+            PyObject *item = PyList_GET_ITEM(obj, start);
+            int overflow;
+            long val;
+
+            if (!PyLong_CheckExact(item)) {
+                break;
+            }
+            val = PyLong_AsLongAndOverflow(item, &overflow);
+            if (overflow != 0 || val < 0 || val > 127) {
+                break;
+            }
+            out[start++] = (uint8_t)val;
+        }
+
+        if (start < size && PyBytesWriter_Resize(writer, pos + start) < 0) {
+            return -1;
+        }
     }
-    else {
-        header[0] = MP_ARRAY32;
-        WRITE_BE32(header + 1, (uint32_t)size);
-        header_size = 5;
+
+    if (start == size) {
+        return 0;
     }
 
-    if (PyBytesWriter_WriteBytes(writer, header, header_size) < 0) {
+    if (Py_EnterRecursiveCall(" while packing a list")) {
         return -1;
     }
-
-    for (Py_ssize_t i = 0; i < size; i++) {
+    for (Py_ssize_t i = start; i < size; i++) {
         PyObject *item = PyList_GET_ITEM(obj, i);
         if (pack_value(writer, item) < 0) {
+            Py_LeaveRecursiveCall();
             return -1;
         }
     }
+    Py_LeaveRecursiveCall();
 
     return 0;
 }
@@ -335,25 +501,10 @@ pack_list(PyBytesWriter *writer, PyObject *obj)
 static int
 pack_dict(PyBytesWriter *writer, PyObject *obj)
 {
-    Py_ssize_t size = PyDict_Size(obj);
+    Py_ssize_t size = PyDict_GET_SIZE(obj);
     uint8_t header[5];
-    Py_ssize_t header_size;
-
-    if (size <= 15) {
-        /* Fixmap */
-        header[0] = 0x80 | (uint8_t)size;
-        header_size = 1;
-    }
-    else if (size <= 0xFFFF) {
-        header[0] = MP_MAP16;
-        WRITE_BE16(header + 1, (uint16_t)size);
-        header_size = 3;
-    }
-    else {
-        header[0] = MP_MAP32;
-        WRITE_BE32(header + 1, (uint32_t)size);
-        header_size = 5;
-    }
+    Py_ssize_t header_size = write_length_header(
+        header, size, 0x80, 15, 0, MP_MAP16, MP_MAP32);
 
     if (PyBytesWriter_WriteBytes(writer, header, header_size) < 0) {
         return -1;
@@ -362,14 +513,16 @@ pack_dict(PyBytesWriter *writer, PyObject *obj)
     PyObject *key, *value;
     Py_ssize_t pos = 0;
 
+    if (Py_EnterRecursiveCall(" while packing a dict")) {
+        return -1;
+    }
     while (PyDict_Next(obj, &pos, &key, &value)) {
-        if (pack_value(writer, key) < 0) {
-            return -1;
-        }
-        if (pack_value(writer, value) < 0) {
+        if (pack_value(writer, key) < 0 || pack_value(writer, value) < 0) {
+            Py_LeaveRecursiveCall();
             return -1;
         }
     }
+    Py_LeaveRecursiveCall();
 
     return 0;
 }
@@ -392,47 +545,43 @@ pack_value(PyBytesWriter *writer, PyObject *obj)
         return PyBytesWriter_WriteBytes(writer, &marker, 1);
     }
 
+    /*
+     * Only exact built-in types are handled here. Subclasses (IntEnum,
+     * registered dict subclasses, ...) and tuples have their own encodings
+     * in the Python implementation, so they are rejected with TypeError
+     * and the caller falls back to it.
+     */
+
     /* Int */
-    if (PyLong_Check(obj)) {
+    if (PyLong_CheckExact(obj)) {
         return pack_int(writer, obj);
     }
 
     /* Float */
-    if (PyFloat_Check(obj)) {
+    if (PyFloat_CheckExact(obj)) {
         return pack_float(writer, obj);
     }
 
     /* String */
-    if (PyUnicode_Check(obj)) {
+    if (PyUnicode_CheckExact(obj)) {
         return pack_str(writer, obj);
     }
 
     /* Bytes */
-    if (PyBytes_Check(obj)) {
+    if (PyBytes_CheckExact(obj)) {
         return pack_bytes(writer, obj);
     }
 
     /* List */
-    if (PyList_Check(obj)) {
+    if (PyList_CheckExact(obj)) {
         return pack_list(writer, obj);
     }
 
     /* Dict */
-    if (PyDict_Check(obj)) {
+    if (PyDict_CheckExact(obj)) {
         return pack_dict(writer, obj);
     }
 
-    /* Tuple - convert to list for now */
-    if (PyTuple_Check(obj)) {
-        PyObject *list = PySequence_List(obj);
-        if (list == NULL) {
-            return -1;
-        }
-        int result = pack_list(writer, list);
-        Py_DECREF(list);
-        return result;
-    }
-
     PyErr_Format(PyExc_TypeError,
                  "Unsupported type for pack: %.100s",
                  Py_TYPE(obj)->tp_name);
@@ -440,22 +589,50 @@ pack_value(PyBytesWriter *writer, PyObject *obj)
 }
 
 
-static PyObject *
-typepack_pack(PyObject *self, PyObject *args)
+/* Root types pack_value can take */
+static inline int
+is_basic_type(PyObject *obj)
+{
+    return obj == Py_None || PyBool_Check(obj) || PyLong_CheckExact(obj) ||
+           PyFloat_CheckExact(obj) || PyUnicode_CheckExact(obj) ||
+           PyBytes_CheckExact(obj) || PyList_CheckExact(obj) ||
+           PyDict_CheckExact(obj);
+}
+
+/* pack_value failed on an extended type (or a subclass, or an int out
+ * of range) somewhere inside the object: clear the error so the Python
+ * implementation can encode the whole object instead */
+static inline int
+pack_needs_python(void)
 {
-    PyObject *obj;
+    if (PyErr_ExceptionMatches(PyExc_TypeError) ||
+        PyErr_ExceptionMatches(PyExc_OverflowError)) {
+        PyErr_Clear();
+        return 1;
+    }
+    return 0;
+}
 
-    if (!PyArg_ParseTuple(args, "O:pack", &obj)) {
-        return NULL;
+
+static PyObject *
+typepack_pack(PyObject *self, PyObject *obj)
+{
+    if (!is_basic_type(obj)) {
+        return call_python_impl_o(&py_pack, "pack", obj);
     }
 
-    PyBytesWriter *writer = PyBytesWriter_Create(64);  /* Initial buffer size */
+    /* Start empty: PyBytesWriter_Create(n) sets the writer size to n,
+     * so any non-zero value would prefix the output with n bytes. */
+    PyBytesWriter *writer = PyBytesWriter_Create(0);
     if (writer == NULL) {
         return NULL;
     }
 
     if (pack_value(writer, obj) < 0) {
         PyBytesWriter_Discard(writer);
+        if (pack_needs_python()) {
+            return call_python_impl_o(&py_pack, "pack", obj);
+        }
         return NULL;
     }
 
@@ -463,30 +640,136 @@ typepack_pack(PyObject *self, PyObject *args)
 }
 
 
-#else /* !HAVE_PYBYTESWRITER */
-
 /*
- * Fallback for Python < 3.15: Use bytearray
+ * pack_into encodes into a scratch writer, then copies into the target.
+ * The writer is kept between calls, so payloads too big for its inline
+ * buffer reuse the allocation it already grew instead of growing a new
+ * one every call. A call takes the writer out of the slot while using
+ * it (a nested call just creates its own), and one that grew past
+ * SCRATCH_WRITER_MAX is freed rather than kept.
  */
+#define SCRATCH_WRITER_MAX  (1 << 20)
+
+static PyBytesWriter *scratch_writer;
+
+static PyBytesWriter *
+take_scratch_writer(void)
+{
+    PyBytesWriter *writer = scratch_writer;
+    if (writer == NULL) {
+        return PyBytesWriter_Create(0);
+    }
+    scratch_writer = NULL;
+    return writer;
+}
+
+static void
+release_scratch_writer(PyBytesWriter *writer)
+{
+    /* Resizing down keeps the allocation and can't fail */
+    if (scratch_writer == NULL &&
+        PyBytesWriter_GetSize(writer) <= SCRATCH_WRITER_MAX &&
+        PyBytesWriter_Resize(writer, 0) == 0) {
+        scratch_writer = writer;
+    }
+    else {
+        PyBytesWriter_Discard(writer);
+    }
+}
+
 
 static PyObject *
-typepack_pack(PyObject *self, PyObject *args)
+typepack_pack_into(PyObject *self, PyObject *args)
 {
-    /* Import and call the Python implementation */
-    PyObject *core_module = PyImport_ImportModule("typepack.core");
-    if (core_module == NULL) {
+    PyObject *obj, *target;
+    Py_ssize_t offset = 0;
+
+    if (!PyArg_ParseTuple(args, "OO|n:pack_into", &obj, &target, &offset)) {
+        return NULL;
+    }
+    if (!is_basic_type(obj)) {
+        return call_python_impl(&py_pack_into, "pack_into", args);
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(target, &view, PyBUF_SIMPLE) < 0) {
+        return NULL;
+    }
+    if (view.readonly) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_TypeError,
+                        "pack_into() argument must be a writable buffer");
+        return NULL;
+    }
+    if (offset < 0 || offset > view.len) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_ValueError, "offset out of range");
         return NULL;
     }
 
-    PyObject *pack_func = PyObject_GetAttrString(core_module, "pack");
-    Py_DECREF(core_module);
-    if (pack_func == NULL) {
+    /* Encode first so a failure leaves the target untouched */
+    PyBytesWriter *writer = take_scratch_writer();
+    if (writer == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    if (pack_value(writer, obj) < 0) {
+        release_scratch_writer(writer);
+        PyBuffer_Release(&view);
+        if (pack_needs_python()) {
+            return call_python_impl(&py_pack_into, "pack_into", args);
+        }
         return NULL;
     }
 
-    PyObject *result = PyObject_Call(pack_func, args, NULL);
-    Py_DECREF(pack_func);
-    return result;
+    const char *data = PyBytesWriter_GetData(writer);
+    Py_ssize_t size = PyBytesWriter_GetSize(writer);
+    Py_ssize_t end = offset + size;
+
+    if (PyByteArray_Check(target)) {
+        /* Drop the export before resizing, then write in place */
+        PyBuffer_Release(&view);
+        if (end > PyByteArray_GET_SIZE(target) &&
+            PyByteArray_Resize(target, end) < 0) {
+            release_scratch_writer(writer);
+            return NULL;
+        }
+        memcpy(PyByteArray_AS_STRING(target) + offset, data, size);
+    }
+    else {
+        if (end > view.len) {
+            PyErr_Format(PyExc_ValueError,
+                         "Buffer too small: need %zd bytes, have %zd",
+                         end, view.len);
+            release_scratch_writer(writer);
+            PyBuffer_Release(&view);
+            return NULL;
+        }
+        memcpy((char *)view.buf + offset, data, size);
+        PyBuffer_Release(&view);
+    }
+
+    release_scratch_writer(writer);
+    return PyLong_FromSsize_t(end);
+}
+
+
+#else /* !HAVE_PYBYTESWRITER */
+
+/*
+ * Fallback for Python < 3.15: defer to the Python implementation
+ */
+
+static PyObject *
+typepack_pack(PyObject *self, PyObject *obj)
+{
+    return call_python_impl_o(&py_pack, "pack", obj);
+}
+
+static PyObject *
+typepack_pack_into(PyObject *self, PyObject *args)
+{
+    return call_python_impl(&py_pack_into, "pack_into", args);
 }
 
 #endif /* HAVE_PYBYTESWRITER */
@@ -496,16 +779,129 @@ typepack_pack(PyObject *self, PyObject *args)
  * Unpack implementation (works on all Python versions)
  */
 
+/*
+ * Cache of decoded short strings (fixstr, ASCII only), shared by map
+ * keys and values across calls. Payloads repeat strings (dict keys,
+ * enum-like values, tags): a hit returns the already built object
+ * instead of decoding and allocating a new one. Direct-mapped and
+ * bounded, so it holds at most STRING_CACHE_SIZE small strings. Values
+ * stop going through it for the rest of a call when its first
+ * STRING_CACHE_PROBE value lookups hit less than 1 time in 8.
+ */
+#define STRING_CACHE_SIZE   1024    /* power of two */
+#define STRING_CACHE_PROBE  64
+
+typedef struct {
+    PyObject *str;
+    uint32_t hash;
+} StringCacheEntry;
+
+static StringCacheEntry string_cache[STRING_CACHE_SIZE];
+
 typedef struct {
     const uint8_t *data;
     Py_ssize_t size;
     Py_ssize_t offset;
+    /* Value string cache lookups and hits in this call */
+    Py_ssize_t value_lookups;
+    Py_ssize_t value_hits;
+    /* Set when decoding stopped at an extension type only the Python
+     * implementation builds */
+    int needs_python;
 } UnpackState;
 
 
 static PyObject *unpack_value(UnpackState *state);
 
 
+/* 32-bit FNV-1a */
+static inline uint32_t
+fnv1a(const uint8_t *p, Py_ssize_t length)
+{
+    uint32_t h = 2166136261u;
+    for (Py_ssize_t i = 0; i < length; i++) {
+        h = (h ^ p[i]) * 16777619u;
+    }
+    return h;
+}
+
+
+/* Decode a fixstr body of length bytes through the string cache. Map
+ * keys are also interned, so the returned dicts share key objects. */
+static PyObject *
+unpack_short_str(UnpackState *state, Py_ssize_t length, int intern)
+{
+    if (state->size - state->offset < length) {
+        PyErr_SetString(PyExc_ValueError, "Unexpected end of data");
+        return NULL;
+    }
+
+    const uint8_t *p = state->data + state->offset;
+    StringCacheEntry *entry = NULL;
+    uint32_t h = 0;
+
+    int use_cache = 1;
+    if (!intern) {
+        if (state->value_lookups < STRING_CACHE_PROBE) {
+            state->value_lookups++;
+        } else if (state->value_hits * 8 < STRING_CACHE_PROBE) {
+            use_cache = 0;
+        }
+    }
+
+    if (use_cache) {
+        h = fnv1a(p, length);
+        entry = &string_cache[h & (STRING_CACHE_SIZE - 1)];
+        PyObject *cached = entry->str;
+        if (cached != NULL && entry->hash == h &&
+                PyUnicode_GET_LENGTH(cached) == length &&
+                memcmp(PyUnicode_1BYTE_DATA(cached), p, length) == 0) {
+            if (intern && !PyUnicode_CHECK_INTERNED(cached)) {
+                PyUnicode_InternInPlace(&entry->str);
+            } else if (!intern) {
+                state->value_hits++;
+            }
+            state->offset += length;
+            Py_INCREF(entry->str);
+            return entry->str;
+        }
+    }
+
+    PyObject *result = PyUnicode_DecodeUTF8((const char *)p, length, NULL);
+    if (result == NULL) {
+        return NULL;
+    }
+    state->offset += length;
+
+    if (PyUnicode_IS_ASCII(result)) {
+        if (intern) {
+            PyUnicode_InternInPlace(&result);
+        }
+        if (entry != NULL) {
+            Py_INCREF(result);
+            Py_XSETREF(entry->str, result);
+            entry->hash = h;
+        }
+    }
+    return result;
+}
+
+
+/* Decode a map key, interning short ASCII keys */
+static PyObject *
+unpack_key(UnpackState *state)
+{
+    if (state->offset < state->size) {
+        uint8_t marker = state->data[state->offset];
+        if (marker >= 0xA0 && marker <= 0xBF) {
+            state->offset++;
+            return unpack_short_str(state, marker & 0x1F, 1);
+        }
+    }
+    return unpack_value(state);
+}
+
+
 static PyObject *
 unpack_str(UnpackState *state, Py_ssize_t length)
 {
@@ -524,20 +920,45 @@ unpack_str(UnpackState *state, Py_ssize_t length)
 static PyObject *
 unpack_array(UnpackState *state, Py_ssize_t length)
 {
+    /* Every item takes at least one byte; checking this first keeps a
+     * corrupt length from sizing a huge list */
+    if (length > state->size - state->offset) {
+        PyErr_SetString(PyExc_ValueError, "Unexpected end of data");
+        return NULL;
+    }
+
+    if (Py_EnterRecursiveCall(" while unpacking an array")) {
+        return NULL;
+    }
+
     PyObject *result = PyList_New(length);
     if (result == NULL) {
+        Py_LeaveRecursiveCall();
         return NULL;
     }
 
-    for (Py_ssize_t i = 0; i < length; i++) {
+    /* Batch path: leading positive fixints are one byte per item (small
+     * ints are cached, so PyLong_FromLong cannot fail here) */
+    Py_ssize_t avail = state->size - state->offset;
+    Py_ssize_t run = fixint_run(state->data + state->offset,
+                                length < avail ? length : avail);
+    for (Py_ssize_t i = 0; i < run; i++) {
+        PyList_SET_ITEM(result, i,
+                        PyLong_FromLong(state->data[state->offset + i]));
+    }
+    state->offset += run;
+
+    for (Py_ssize_t i = run; i < length; i++) {
         PyObject *item = unpack_value(state);
         if (item == NULL) {
             Py_DECREF(result);
+            Py_LeaveRecursiveCall();
             return NULL;
         }
         PyList_SET_ITEM(result, i, item);
     }
 
+    Py_LeaveRecursiveCall();
     return result;
 }
 
@@ -545,41 +966,173 @@ unpack_array(UnpackState *state, Py_ssize_t length)
 static PyObject *
 unpack_map(UnpackState *state, Py_ssize_t length)
 {
+    if (Py_EnterRecursiveCall(" while unpacking a map")) {
+        return NULL;
+    }
+
     PyObject *result = PyDict_New();
     if (result == NULL) {
-        return NULL;
+        goto error;
     }
 
     for (Py_ssize_t i = 0; i < length; i++) {
-        PyObject *key = unpack_value(state);
+        PyObject *key = unpack_key(state);
         if (key == NULL) {
-            Py_DECREF(result);
-            return NULL;
+            goto error;
         }
 
         PyObject *value = unpack_value(state);
         if (value == NULL) {
             Py_DECREF(key);
-            Py_DECREF(result);
-            return NULL;
+            goto error;
         }
 
         if (PyDict_SetItem(result, key, value) < 0) {
             Py_DECREF(key);
             Py_DECREF(value);
-            Py_DECREF(result);
-            return NULL;
+            goto error;
         }
 
         Py_DECREF(key);
         Py_DECREF(value);
     }
 
+    Py_LeaveRecursiveCall();
+    return result;
+
+error:
+    Py_XDECREF(result);
+    Py_LeaveRecursiveCall();
+    return NULL;
+}
+
+
+static PyObject *
+unpack_bin(UnpackState *state, Py_ssize_t length)
+{
+    if (state->offset + length > state->size) {
+        PyErr_SetString(PyExc_ValueError, "Unexpected end of data");
+        return NULL;
+    }
+
+    PyObject *result = PyBytes_FromStringAndSize(
+        (const char *)(state->data + state->offset), length);
+    state->offset += length;
+    return result;
+}
+
+
+/* Decode an EXT_INT_ARRAY payload: a width byte (1, 2 or 4), then the
+ * unsigned items big-endian */
+static PyObject *
+unpack_int_array(const uint8_t *p, Py_ssize_t length)
+{
+    Py_ssize_t width = length > 0 ? p[0] : 0;
+    if ((width != 1 && width != 2 && width != 4) || (length - 1) % width) {
+        PyErr_SetString(PyExc_ValueError, "Invalid int array");
+        return NULL;
+    }
+
+    Py_ssize_t count = (length - 1) / width;
+    PyObject *result = PyList_New(count);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    p++;
+    for (Py_ssize_t i = 0; i < count; i++, p += width) {
+        unsigned long value;
+        if (width == 1) {
+            value = p[0];
+        } else if (width == 2) {
+            value = load_be16(p);
+        } else {
+            value = load_be32(p);
+        }
+        PyObject *item = PyLong_FromUnsignedLong(value);
+        if (item == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, item);
+    }
     return result;
 }
 
 
+/* Decode an extension value whose marker was just consumed. Only
+ * EXT_INT_ARRAY is handled in C; the other types raise ValueError so
+ * callers can fall back to the Python implementation. */
 static PyObject *
+unpack_ext(UnpackState *state, uint8_t marker)
+{
+    const uint8_t *p = state->data + state->offset;
+    Py_ssize_t avail = state->size - state->offset;
+    Py_ssize_t header;
+    uint64_t length;
+
+    switch (marker) {
+    case MP_FIXEXT1:
+        header = 0;
+        length = 1;
+        break;
+    case MP_FIXEXT2:
+        header = 0;
+        length = 2;
+        break;
+    case MP_FIXEXT4:
+        header = 0;
+        length = 4;
+        break;
+    case MP_FIXEXT8:
+        header = 0;
+        length = 8;
+        break;
+    case MP_FIXEXT16:
+        header = 0;
+        length = 16;
+        break;
+    case MP_EXT8:
+        header = 1;
+        length = avail >= 1 ? p[0] : 0;
+        break;
+    case MP_EXT16:
+        header = 2;
+        length = avail >= 2 ? load_be16(p) : 0;
+        break;
+    default:
+        header = 4;
+        length = avail >= 4 ? load_be32(p) : 0;
+        break;
+    }
+
+    if (avail < header + 1 || (uint64_t)(avail - header - 1) < length) {
+        PyErr_SetString(PyExc_ValueError, "Unexpected end of data");
+        return NULL;
+    }
+
+    uint8_t type_code = p[header];
+    if (type_code != EXT_INT_ARRAY) {
+        char hex[3];
+        snprintf(hex, sizeof(hex), "%02X", type_code);
+        PyErr_Format(PyExc_ValueError,
+                     "Extension type 0x%s is not supported by the C decoder",
+                     hex);
+        state->needs_python = 1;
+        return NULL;
+    }
+
+    state->offset += header + 1 + (Py_ssize_t)length;
+    return unpack_int_array(p + header + 1, (Py_ssize_t)length);
+}
+
+
+/* Bail out to the truncation error unless n more bytes are available */
+#define NEED(n) \
+    if (state->size - state->offset < (Py_ssize_t)(n)) goto error
+
+
+static TP_HOT PyObject *
 unpack_value(UnpackState *state)
 {
     if (state->offset >= state->size) {
@@ -587,7 +1140,9 @@ unpack_value(UnpackState *state)
         return NULL;
     }
 
-    uint8_t marker = state->data[state->offset++];
+    const uint8_t *p = state->data + state->offset;
+    uint8_t marker = *p++;
+    state->offset++;
 
     /* Positive fixint (0x00 - 0x7F) */
     if (marker <= 0x7F) {
@@ -595,21 +1150,18 @@ unpack_value(UnpackState *state)
     }
 
     /* Fixmap (0x80 - 0x8F) */
-    if (marker >= 0x80 && marker <= 0x8F) {
-        Py_ssize_t length = marker & 0x0F;
-        return unpack_map(state, length);
+    if (marker <= 0x8F) {
+        return unpack_map(state, marker & 0x0F);
     }
 
     /* Fixarray (0x90 - 0x9F) */
-    if (marker >= 0x90 && marker <= 0x9F) {
-        Py_ssize_t length = marker & 0x0F;
-        return unpack_array(state, length);
+    if (marker <= 0x9F) {
+        return unpack_array(state, marker & 0x0F);
     }
 
     /* Fixstr (0xA0 - 0xBF) */
-    if (marker >= 0xA0 && marker <= 0xBF) {
-        Py_ssize_t length = marker & 0x1F;
-        return unpack_str(state, length);
+    if (marker <= 0xBF) {
+        return unpack_short_str(state, marker & 0x1F, 0);
     }
 
     /* Negative fixint (0xE0 - 0xFF) */
@@ -617,164 +1169,134 @@ unpack_value(UnpackState *state)
         return PyLong_FromLong((int8_t)marker);
     }
 
-    /* None */
-    if (marker == MP_NONE) {
+    /* 0xC0 - 0xDF: dense enough for the compiler to emit a jump table */
+    switch (marker) {
+    case MP_NONE:
         Py_RETURN_NONE;
-    }
-
-    /* False */
-    if (marker == MP_FALSE) {
+    case MP_FALSE:
         Py_RETURN_FALSE;
-    }
-
-    /* True */
-    if (marker == MP_TRUE) {
+    case MP_TRUE:
         Py_RETURN_TRUE;
-    }
 
     /* Binary */
-    if (marker == MP_BIN8) {
-        if (state->offset >= state->size) goto error;
-        Py_ssize_t length = state->data[state->offset++];
-        if (state->offset + length > state->size) goto error;
-        PyObject *result = PyBytes_FromStringAndSize(
-            (const char *)(state->data + state->offset), length);
-        state->offset += length;
-        return result;
-    }
-    if (marker == MP_BIN16) {
-        if (state->offset + 2 > state->size) goto error;
-        Py_ssize_t length = READ_BE16(state->data + state->offset);
+    case MP_BIN8:
+        NEED(1);
+        state->offset += 1;
+        return unpack_bin(state, p[0]);
+    case MP_BIN16:
+        NEED(2);
         state->offset += 2;
-        if (state->offset + length > state->size) goto error;
-        PyObject *result = PyBytes_FromStringAndSize(
-            (const char *)(state->data + state->offset), length);
-        state->offset += length;
-        return result;
-    }
-    if (marker == MP_BIN32) {
-        if (state->offset + 4 > state->size) goto error;
-        Py_ssize_t length = READ_BE32(state->data + state->offset);
+        return unpack_bin(state, load_be16(p));
+    case MP_BIN32:
+        NEED(4);
         state->offset += 4;
-        if (state->offset + length > state->size) goto error;
-        PyObject *result = PyBytes_FromStringAndSize(
-            (const char *)(state->data + state->offset), length);
-        state->offset += length;
-        return result;
-    }
+        return unpack_bin(state, load_be32(p));
 
     /* Float */
-    if (marker == MP_FLOAT32) {
-        if (state->offset + 4 > state->size) goto error;
+    case MP_FLOAT32: {
         union { float f; uint32_t i; } u;
-        u.i = READ_BE32(state->data + state->offset);
+        NEED(4);
+        u.i = load_be32(p);
         state->offset += 4;
         return PyFloat_FromDouble(u.f);
     }
-    if (marker == MP_FLOAT64) {
-        if (state->offset + 8 > state->size) goto error;
+    case MP_FLOAT64: {
         union { double d; uint64_t i; } u;
-        u.i = READ_BE64(state->data + state->offset);
+        NEED(8);
+        u.i = load_be64(p);
         state->offset += 8;
         return PyFloat_FromDouble(u.d);
     }
 
     /* Unsigned integers */
-    if (marker == MP_UINT8) {
-        if (state->offset >= state->size) goto error;
-        return PyLong_FromUnsignedLong(state->data[state->offset++]);
-    }
-    if (marker == MP_UINT16) {
-        if (state->offset + 2 > state->size) goto error;
-        uint16_t val = READ_BE16(state->data + state->offset);
+    case MP_UINT8:
+        NEED(1);
+        state->offset += 1;
+        return PyLong_FromLong(p[0]);
+    case MP_UINT16:
+        NEED(2);
         state->offset += 2;
-        return PyLong_FromUnsignedLong(val);
-    }
-    if (marker == MP_UINT32) {
-        if (state->offset + 4 > state->size) goto error;
-        uint32_t val = READ_BE32(state->data + state->offset);
+        return PyLong_FromLong(load_be16(p));
+    case MP_UINT32:
+        NEED(4);
         state->offset += 4;
-        return PyLong_FromUnsignedLong(val);
-    }
-    if (marker == MP_UINT64) {
-        if (state->offset + 8 > state->size) goto error;
-        uint64_t val = READ_BE64(state->data + state->offset);
+        return PyLong_FromUnsignedLong(load_be32(p));
+    case MP_UINT64:
+        NEED(8);
         state->offset += 8;
-        return PyLong_FromUnsignedLongLong(val);
-    }
+        return PyLong_FromUnsignedLongLong(load_be64(p));
 
     /* Signed integers */
-    if (marker == MP_INT8) {
-        if (state->offset >= state->size) goto error;
-        return PyLong_FromLong((int8_t)state->data[state->offset++]);
-    }
-    if (marker == MP_INT16) {
-        if (state->offset + 2 > state->size) goto error;
-        int16_t val = (int16_t)READ_BE16(state->data + state->offset);
+    case MP_INT8:
+        NEED(1);
+        state->offset += 1;
+        return PyLong_FromLong((int8_t)p[0]);
+    case MP_INT16:
+        NEED(2);
         state->offset += 2;
-        return PyLong_FromLong(val);
-    }
-    if (marker == MP_INT32) {
-        if (state->offset + 4 > state->size) goto error;
-        int32_t val = (int32_t)READ_BE32(state->data + state->offset);
+        return PyLong_FromLong((int16_t)load_be16(p));
+    case MP_INT32:
+        NEED(4);
         state->offset += 4;
-        return PyLong_FromLong(val);
-    }
-    if (marker == MP_INT64) {
-        if (state->offset + 8 > state->size) goto error;
-        int64_t val = (int64_t)READ_BE64(state->data + state->offset);
+        return PyLong_FromLong((int32_t)load_be32(p));
+    case MP_INT64:
+        NEED(8);
         state->offset += 8;
-        return PyLong_FromLongLong(val);
-    }
+        return PyLong_FromLongLong((int64_t)load_be64(p));
 
     /* Strings */
-    if (marker == MP_STR8) {
-        if (state->offset >= state->size) goto error;
-        Py_ssize_t length = state->data[state->offset++];
-        return unpack_str(state, length);
-    }
-    if (marker == MP_STR16) {
-        if (state->offset + 2 > state->size) goto error;
-        Py_ssize_t length = READ_BE16(state->data + state->offset);
+    case MP_STR8:
+        NEED(1);
+        state->offset += 1;
+        return unpack_str(state, p[0]);
+    case MP_STR16:
+        NEED(2);
         state->offset += 2;
-        return unpack_str(state, length);
-    }
-    if (marker == MP_STR32) {
-        if (state->offset + 4 > state->size) goto error;
-        Py_ssize_t length = READ_BE32(state->data + state->offset);
+        return unpack_str(state, load_be16(p));
+    case MP_STR32:
+        NEED(4);
         state->offset += 4;
-        return unpack_str(state, length);
-    }
+        return unpack_str(state, load_be32(p));
 
     /* Arrays */
-    if (marker == MP_ARRAY16) {
-        if (state->offset + 2 > state->size) goto error;
-        Py_ssize_t length = READ_BE16(state->data + state->offset);
+    case MP_ARRAY16:
+        NEED(2);
         state->offset += 2;
-        return unpack_array(state, length);
-    }
-    if (marker == MP_ARRAY32) {
-        if (state->offset + 4 > state->size) goto error;
-        Py_ssize_t length = READ_BE32(state->data + state->offset);
+        return unpack_array(state, load_be16(p));
+    case MP_ARRAY32:
+        NEED(4);
         state->offset += 4;
-        return unpack_array(state, length);
-    }
+        return unpack_array(state, load_be32(p));
 
     /* Maps */
-    if (marker == MP_MAP16) {
-        if (state->offset + 2 > state->size) goto error;
-        Py_ssize_t length = READ_BE16(state->data + state->offset);
+    case MP_MAP16:
+        NEED(2);
         state->offset += 2;
-        return unpack_map(state, length);
-    }
-    if (marker == MP_MAP32) {
-        if (state->offset + 4 > state->size) goto error;
-        Py_ssize_t length = READ_BE32(state->data + state->offset);
+        return unpack_map(state, load_be16(p));
+    case MP_MAP32:
+        NEED(4);
         state->offset += 4;
-        return unpack_map(state, length);
-    }
-
-    PyErr_Format(PyExc_ValueError, "Unknown format marker: 0x%02X", marker);
+        return unpack_map(state, load_be32(p));
+
+    /* Extensions */
+    case MP_FIXEXT1:
+    case MP_FIXEXT2:
+    case MP_FIXEXT4:
+    case MP_FIXEXT8:
+    case MP_FIXEXT16:
+    case MP_EXT8:
+    case MP_EXT16:
+    case MP_EXT32:
+        return unpack_ext(state, marker);
+
+    default:
+        break;
+    }
+
+    /* PyErr_Format has no %X before 3.12, so format the byte first */
+    char hex[3];
+    snprintf(hex, sizeof(hex), "%02X", marker);
+    PyErr_Format(PyExc_ValueError, "Unknown format marker: 0x%s", hex);
     return NULL;
 
 error:
@@ -782,13 +1304,29 @@ error:
     return NULL;
 }
 
+#undef NEED
+
+
+/* unpack_value stopped at an extension type the C decoder doesn't
+ * build: clear the error so the Python implementation decodes the
+ * whole object instead. Malformed data keeps the C error. */
+static inline int
+unpack_needs_python(const UnpackState *state)
+{
+    if (state->needs_python && PyErr_ExceptionMatches(PyExc_ValueError)) {
+        PyErr_Clear();
+        return 1;
+    }
+    return 0;
+}
+
 
 static PyObject *
-typepack_unpack(PyObject *self, PyObject *args)
+typepack_unpack(PyObject *self, PyObject *arg)
 {
     Py_buffer buffer;
 
-    if (!PyArg_ParseTuple(args, "y*:unpack", &buffer)) {
+    if (PyObject_GetBuffer(arg, &buffer, PyBUF_SIMPLE) < 0) {
         return NULL;
     }
 
@@ -800,6 +1338,401 @@ typepack_unpack(PyObject *self, PyObject *args)
 
     PyObject *result = unpack_value(&state);
     PyBuffer_Release(&buffer);
+    if (result == NULL && unpack_needs_python(&state)) {
+        return call_python_impl_o(&py_unpack, "unpack", arg);
+    }
+    return result;
+}
+
+
+static PyObject *
+typepack_unpack_from_buffer(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    Py_ssize_t offset = 0;
+
+    if (!PyArg_ParseTuple(args, "y*|n:unpack_from_buffer", &buffer, &offset)) {
+        return NULL;
+    }
+    if (offset < 0 || offset > buffer.len) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "offset out of range");
+        return NULL;
+    }
+
+    /* Decode in place: the buffer is never copied into a bytes object */
+    UnpackState state = {
+        .data = (const uint8_t *)buffer.buf,
+        .size = buffer.len,
+        .offset = offset
+    };
+
+    PyObject *result = unpack_value(&state);
+    PyBuffer_Release(&buffer);
+    if (result == NULL) {
+        if (unpack_needs_python(&state)) {
+            return call_python_impl(&py_unpack_from_buffer,
+                                    "unpack_from_buffer", args);
+        }
+        return NULL;
+    }
+    return Py_BuildValue("(Nn)", result, state.offset);
+}
+
+
+/*
+ * Batched decode of pack_many output: 4-byte big-endian length prefixed
+ * records, where a record may be an EXT_TABLE block holding a run of
+ * same-schema dicts as [row count, keys, column...]
+ */
+
+/* Set *payload to the offset of the table payload if the record is an
+ * EXT_TABLE block */
+static int
+record_is_table(const uint8_t *p, Py_ssize_t length, Py_ssize_t *payload)
+{
+    Py_ssize_t type_at;
+
+    if (length < 3) {
+        return 0;
+    }
+    switch (p[0]) {
+    case MP_EXT8:
+        type_at = 2;
+        break;
+    case MP_EXT16:
+        type_at = 3;
+        break;
+    case MP_EXT32:
+        type_at = 5;
+        break;
+    default:
+        return 0;
+    }
+    if (type_at >= length || p[type_at] != EXT_TABLE) {
+        return 0;
+    }
+    *payload = type_at + 1;
+    return 1;
+}
+
+
+/* Read the row count that starts a table payload; -1 if malformed */
+static Py_ssize_t
+table_row_count(const uint8_t *p, Py_ssize_t n)
+{
+    Py_ssize_t i;
+
+    if (n < 1) {
+        return -1;
+    }
+    if (p[0] >= 0x90 && p[0] <= 0x9F) {
+        i = 1;
+    } else if (p[0] == MP_ARRAY16) {
+        i = 3;
+    } else if (p[0] == MP_ARRAY32) {
+        i = 5;
+    } else {
+        return -1;
+    }
+
+    if (n <= i) {
+        return -1;
+    }
+    p += i;
+    n -= i;
+    if (p[0] <= 0x7F) {
+        return p[0];
+    }
+    switch (p[0]) {
+    case MP_UINT8:
+        return n >= 2 ? p[1] : -1;
+    case MP_UINT16:
+        return n >= 3 ? load_be16(p + 1) : -1;
+    case MP_UINT32:
+        return n >= 5 ? (Py_ssize_t)load_be32(p + 1) : -1;
+    default:
+        return -1;
+    }
+}
+
+
+/* Number of objects in the record p[0..length): the row count of a
+ * table block, else 1. -1 with ValueError set for a malformed table. */
+static Py_ssize_t
+record_object_count(const uint8_t *p, Py_ssize_t length)
+{
+    Py_ssize_t payload;
+
+    if (!record_is_table(p, length, &payload)) {
+        return 1;
+    }
+    Py_ssize_t rows = table_row_count(p + payload, length - payload);
+    /* Tables have at least one column, so every row takes a byte: this
+     * bounds the object count by the input size */
+    if (rows < 0 || rows > length) {
+        PyErr_SetString(PyExc_ValueError, "Invalid table block");
+        return -1;
+    }
+    return rows;
+}
+
+
+/* Check the length prefix at data[*offset] and step over it; sets
+ * *length to the record length. -1 with ValueError set if truncated. */
+static int
+read_record_length(const uint8_t *data, Py_ssize_t size, Py_ssize_t *offset,
+                   Py_ssize_t *length)
+{
+    if (size - *offset < 4) {
+        PyErr_SetString(PyExc_ValueError,
+                        "Unexpected end of data while reading length");
+        return -1;
+    }
+    uint32_t n = load_be32(data + *offset);
+    *offset += 4;
+    if ((uint64_t)(size - *offset) < n) {
+        PyErr_SetString(PyExc_ValueError,
+                        "Unexpected end of data while reading object");
+        return -1;
+    }
+    *length = (Py_ssize_t)n;
+    return 0;
+}
+
+
+/* Decode a table payload and store its rows as dicts at out[index:] */
+static int
+unpack_table_rows(UnpackState *state, Py_ssize_t rows,
+                  PyObject *out, Py_ssize_t index)
+{
+    PyObject *table = unpack_value(state);
+    if (table == NULL) {
+        return -1;
+    }
+
+    int rc = -1;
+    if (!PyList_CheckExact(table) || PyList_GET_SIZE(table) < 2) {
+        goto invalid;
+    }
+    PyObject *keys = PyList_GET_ITEM(table, 1);
+    if (!PyList_CheckExact(keys)) {
+        goto invalid;
+    }
+    Py_ssize_t nkeys = PyList_GET_SIZE(keys);
+    if (nkeys == 0 || PyList_GET_SIZE(table) != nkeys + 2) {
+        goto invalid;
+    }
+    /* pack_many only writes str keys; anything else could be unhashable */
+    for (Py_ssize_t k = 0; k < nkeys; k++) {
+        if (!PyUnicode_CheckExact(PyList_GET_ITEM(keys, k))) {
+            goto invalid;
+        }
+    }
+    for (Py_ssize_t k = 0; k < nkeys; k++) {
+        PyObject *column = PyList_GET_ITEM(table, k + 2);
+        if (!PyList_CheckExact(column) || PyList_GET_SIZE(column) != rows) {
+            goto invalid;
+        }
+    }
+
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        PyObject *row = PyDict_New();
+        if (row == NULL) {
+            goto done;
+        }
+        for (Py_ssize_t k = 0; k < nkeys; k++) {
+            PyObject *column = PyList_GET_ITEM(table, k + 2);
+            if (PyDict_SetItem(row, PyList_GET_ITEM(keys, k),
+                               PyList_GET_ITEM(column, i)) < 0) {
+                Py_DECREF(row);
+                goto done;
+            }
+        }
+        PyList_SET_ITEM(out, index + i, row);
+    }
+    rc = 0;
+    goto done;
+
+invalid:
+    PyErr_SetString(PyExc_ValueError, "Invalid table block");
+done:
+    Py_DECREF(table);
+    return rc;
+}
+
+
+/*
+ * unpack_many(data, fallback) -> list
+ *
+ * Counts the objects first by hopping over the length prefixes, then
+ * decodes into a presized list. A record the C decoder rejects with
+ * ValueError (extension types) is passed to fallback(data, offset,
+ * length), which must return the list of objects in that record.
+ */
+static PyObject *
+typepack_unpack_many(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    PyObject *fallback;
+
+    if (!PyArg_ParseTuple(args, "y*O:unpack_many", &buffer, &fallback)) {
+        return NULL;
+    }
+
+    const uint8_t *data = (const uint8_t *)buffer.buf;
+    Py_ssize_t size = buffer.len;
+    PyObject *result = NULL;
+    Py_ssize_t count = 0;
+    Py_ssize_t offset = 0;
+    /* One state is shared by all records, so the value cache probe
+     * covers the whole buffer */
+    UnpackState state = {
+        .data = data,
+        .size = 0,
+        .offset = 0
+    };
+
+    /* Pass 1: validate the framing and count the objects */
+    while (offset < size) {
+        Py_ssize_t length;
+        if (read_record_length(data, size, &offset, &length) < 0) {
+            goto done;
+        }
+        Py_ssize_t objects = record_object_count(data + offset, length);
+        if (objects < 0) {
+            goto done;
+        }
+        count += objects;
+        offset += length;
+    }
+
+    result = PyList_New(count);
+    if (result == NULL) {
+        goto done;
+    }
+
+    /* Pass 2: decode each record into its slots */
+    Py_ssize_t index = 0;
+    offset = 0;
+    while (offset < size) {
+        Py_ssize_t length = load_be32(data + offset);
+        Py_ssize_t start = offset + 4;
+        Py_ssize_t payload;
+        Py_ssize_t items = 1;
+        int ok;
+
+        state.size = start + length;
+        if (record_is_table(data + start, length, &payload)) {
+            items = table_row_count(data + start + payload, length - payload);
+            state.offset = start + payload;
+            ok = unpack_table_rows(&state, items, result, index) == 0;
+        } else {
+            state.offset = start;
+            PyObject *item = unpack_value(&state);
+            if (item != NULL) {
+                PyList_SET_ITEM(result, index, item);
+            }
+            ok = item != NULL;
+        }
+
+        if (!ok) {
+            if (!PyErr_ExceptionMatches(PyExc_ValueError)) {
+                goto error;
+            }
+            PyErr_Clear();
+            PyObject *decoded = PyObject_CallFunction(
+                fallback, "Onn", buffer.obj, start, length);
+            if (decoded == NULL) {
+                goto error;
+            }
+            if (!PyList_CheckExact(decoded) ||
+                    PyList_GET_SIZE(decoded) != items) {
+                Py_DECREF(decoded);
+                PyErr_SetString(PyExc_ValueError,
+                                "fallback returned the wrong number of objects");
+                goto error;
+            }
+            for (Py_ssize_t i = 0; i < items; i++) {
+                PyObject *item = PyList_GET_ITEM(decoded, i);
+                PyObject *partial = PyList_GET_ITEM(result, index + i);
+                Py_INCREF(item);
+                PyList_SET_ITEM(result, index + i, item);
+                Py_XDECREF(partial);
+            }
+            Py_DECREF(decoded);
+        }
+
+        index += items;
+        offset = start + length;
+    }
+    goto done;
+
+error:
+    Py_CLEAR(result);
+done:
+    PyBuffer_Release(&buffer);
+    return result;
+}
+
+
+/*
+ * index_many(data) -> (offsets, firsts, count)
+ *
+ * Hops over the length prefixes like the first pass of unpack_many
+ * without decoding anything. For each record returns the offset of its
+ * payload and the index of its first object, plus the object count.
+ */
+static PyObject *
+typepack_index_many(PyObject *self, PyObject *arg)
+{
+    Py_buffer buffer;
+
+    if (PyObject_GetBuffer(arg, &buffer, PyBUF_SIMPLE) < 0) {
+        return NULL;
+    }
+
+    const uint8_t *data = (const uint8_t *)buffer.buf;
+    Py_ssize_t size = buffer.len;
+    PyObject *result = NULL;
+    PyObject *offsets = PyList_New(0);
+    PyObject *firsts = PyList_New(0);
+    Py_ssize_t count = 0;
+    Py_ssize_t offset = 0;
+
+    if (offsets == NULL || firsts == NULL) {
+        goto done;
+    }
+    while (offset < size) {
+        Py_ssize_t length;
+        if (read_record_length(data, size, &offset, &length) < 0) {
+            goto done;
+        }
+        Py_ssize_t objects = record_object_count(data + offset, length);
+        if (objects < 0) {
+            goto done;
+        }
+
+        PyObject *start = PyLong_FromSsize_t(offset);
+        PyObject *first = PyLong_FromSsize_t(count);
+        int rc = (start == NULL || first == NULL ||
+                  PyList_Append(offsets, start) < 0 ||
+                  PyList_Append(firsts, first) < 0) ? -1 : 0;
+        Py_XDECREF(start);
+        Py_XDECREF(first);
+        if (rc < 0) {
+            goto done;
+        }
+
+        count += objects;
+        offset += length;
+    }
+    result = Py_BuildValue("(OOn)", offsets, firsts, count);
+
+done:
+    Py_XDECREF(offsets);
+    Py_XDECREF(firsts);
+    PyBuffer_Release(&buffer);
     return result;
 }
 
@@ -823,10 +1756,18 @@ typepack_has_pybyteswriter(PyObject *self, PyObject *Py_UNUSED(args))
  */
 
 static PyMethodDef typepack_methods[] = {
-    {"pack", typepack_pack, METH_VARARGS,
+    {"pack", typepack_pack, METH_O,
      "Serialize a Python object to binary format."},
-    {"unpack", typepack_unpack, METH_VARARGS,
+    {"pack_into", typepack_pack_into, METH_VARARGS,
+     "Serialize a Python object into a writable buffer at an offset."},
+    {"unpack", typepack_unpack, METH_O,
      "Deserialize binary data to a Python object."},
+    {"unpack_from_buffer", typepack_unpack_from_buffer, METH_VARARGS,
+     "Deserialize one object from a buffer at an offset."},
+    {"unpack_many", typepack_unpack_many, METH_VARARGS,
+     "Deserialize all length-prefixed records written by pack_many."},
+    {"index_many", typepack_index_many, METH_O,
+     "Return the record offsets and first object indexes of pack_many output."},
     {"has_pybyteswriter", typepack_has_pybyteswriter, METH_NOARGS,
      "Return True if compiled with PyBytesWriter support (Python 3.15+)."},
     {NULL, NULL, 0, NULL}
@@ -85,6 +85,11 @@ class TestFloats:
         data = typepack.pack(1e100)
         assert typepack.unpack(data) == 1e100
 
+    def test_float32_input(self):
+        data = b"\xca\x3f\xc0\x00\x00"  # 1.5 as float32
+        assert typepack.unpack(data) == 1.5
+        assert typepack.unpack_basic(data) == 1.5
+
 
 class TestStrings:
     """Test string serialization."""
@@ -174,6 +179,31 @@ class TestLists:
         data = typepack.pack(value)
         assert typepack.unpack(data) == value
 
+    def test_small_ints_one_byte_each(self):
+        value = list(range(128))
+        data = typepack.pack(value)
+        assert data == b"\xdc\x00\x80" + bytes(range(128))
+        assert typepack.unpack(data) == value
+
+    def test_small_ints_with_bools(self):
+        value = [1, True, 0, False]
+        data = typepack.pack(value)
+        result = typepack.unpack(data)
+        assert result == value
+        assert result[1] is True
+        assert result[3] is False
+
+    def test_small_ints_then_wider(self):
+        value = [1, 2, 3, 300, -1, 4, 5]
+        data = typepack.pack(value)
+        assert typepack.unpack(data) == value
+
+    def test_long_int_list(self):
+        value = [i * 2**40 - 2**50 for i in range(64)]
+        data = typepack.pack(value)
+        assert data == typepack.core.pack(value)
+        assert typepack.unpack(data) == value
+
 
 class TestDicts:
     """Test dict serialization."""
@@ -208,6 +238,41 @@ class TestDicts:
         data = typepack.pack(value)
         assert typepack.unpack(data) == value
 
+    def test_repeated_schema(self):
+        from typepack.core import _pack_dict_items
+
+        many = {f"k{i}": i for i in range(20)}
+        values = [
+            {"name": "Ana", "age": 30, "active": True, "score": 1.5, "note": None},
+            {"name": "é" * 40, "age": -(2**40), "active": False, "score": -0.0, "note": None},
+            {"name": "x", "age": 1},
+            {"name": "x", "age": True},
+            {"nested": {"id": 1}, "items": [1, 2], "raw": b"\x00", "at": (1, 2)},
+            many,
+            {},
+        ]
+        for value in values:
+            expected = bytearray()
+            _pack_dict_items(value, expected)
+            for _ in range(3):
+                data = typepack.core.pack(value)
+                assert data == bytes(expected)
+                assert typepack.unpack(data) == value
+        assert type(typepack.unpack(typepack.core.pack({"name": "x", "age": True}))["age"]) is bool
+
+    def test_repeated_schema_str_subclass_key(self):
+        from enum import Enum
+        from typepack.core import _pack_dict_items
+
+        class Color(str, Enum):
+            A = "schema-key-a"
+
+        for _ in range(2):
+            typepack.core.pack({"schema-key-a": 1})
+        expected = bytearray()
+        _pack_dict_items({Color.A: 1}, expected)
+        assert typepack.core.pack({Color.A: 1}) == bytes(expected)
+
     def test_with_list_values(self):
         value = {"items": [1, 2, 3], "tags": ["python", "serialization"]}
         data = typepack.pack(value)
@@ -240,6 +305,81 @@ class TestErrors:
         with pytest.raises(TypeError):
             typepack.pack(object())
 
+    def test_unsupported_type_nested(self):
+        with pytest.raises(TypeError):
+            typepack.pack({"items": [1, object()]})
+
+    def test_unknown_marker(self):
+        for unpack in (typepack.unpack, typepack.unpack_basic):
+            with pytest.raises(ValueError, match="0xC1"):
+                unpack(b"\xc1")
+
+    def test_self_referencing_list(self):
+        value = []
+        value.append(value)
+        with pytest.raises(RecursionError):
+            typepack.pack(value)
+
+
+class TestImplementationsAgree:
+    """Accelerated pack must produce the same bytes as the Python one."""
+
+    def test_basic_payloads(self):
+        values = [
+            None,
+            True,
+            -(2**63),
+            2**64 - 1,
+            1.5,
+            "text",
+            b"raw",
+            [1, "a", None, [2.5, False]],
+            {"name": "Ana", "age": 30, "tags": ["a", "b"], 1: {"x": b""}},
+        ]
+        for value in values:
+            assert typepack.pack(value) == typepack.core.pack(value)
+
+    def test_length_header_boundaries(self):
+        for size in (0, 15, 16, 31, 32, 255, 256, 65535, 65536):
+            values = [
+                "a" * size,
+                b"b" * size,
+                [None] * size,
+                {i: None for i in range(size)},
+            ]
+            for value in values:
+                data = typepack.pack(value)
+                assert data == typepack.core.pack(value)
+                assert typepack.unpack(data) == value
+
+    def test_extended_types_nested_in_basic(self):
+        from datetime import datetime
+        from enum import IntEnum
+
+        class Level(IntEnum):
+            LOW = 1
+
+        class Name(str):
+            pass
+
+        values = [
+            {"at": datetime(2024, 1, 1), "coords": (1, 2)},
+            [1, 2, Level.LOW],
+            {"name": Name("Ana")},
+            [{"tags": {"a"}}],
+        ]
+        for value in values:
+            assert typepack.pack(value) == typepack.core.pack(value)
+
+    def test_basic_functions_defer_extended_types(self):
+        from datetime import datetime
+
+        values = [(1, 2), [datetime(2024, 1, 1)], {"at": datetime(2024, 1, 1)}]
+        for value in values:
+            data = typepack.pack_basic(value)
+            assert data == typepack.core.pack(value)
+            assert typepack.unpack_basic(data) == typepack.core.unpack(data)
+
 
 class TestBinarySize:
     """Test that binary output is compact."""
@@ -251,3 +391,117 @@ class TestBinarySize:
         packed = typepack.pack(value)
         json_bytes = json.dumps(value).encode("utf-8")
         assert len(packed) < len(json_bytes)
+
+
+class TestPackInto:
+    """Test serializing into caller-owned buffers."""
+
+    def test_append_to_empty_bytearray(self):
+        buffer = bytearray()
+        end = typepack.pack_into({"id": 1}, buffer)
+        assert end == len(buffer)
+        assert bytes(buffer) == typepack.pack({"id": 1})
+
+    def test_offset_and_reuse(self):
+        buffer = bytearray(b"head")
+        end = typepack.pack_into([1, 2, 3], buffer, 4)
+        assert buffer[:4] == b"head"
+        assert typepack.unpack(bytes(buffer[4:end])) == [1, 2, 3]
+
+        end = typepack.pack_into("x", buffer, 4)
+        assert typepack.unpack(bytes(buffer[4:end])) == "x"
+
+    def test_bytearray_grows(self):
+        buffer = bytearray(2)
+        end = typepack.pack_into("a" * 100, buffer, 1)
+        assert end == len(buffer) == 1 + len(typepack.pack("a" * 100))
+
+    def test_fixed_size_buffer(self):
+        buffer = memoryview(bytearray(8))
+        end = typepack.pack_into(300, buffer)
+        assert bytes(buffer[:end]) == typepack.pack(300)
+
+        with pytest.raises(ValueError, match="too small"):
+            typepack.pack_into("a" * 20, buffer)
+
+    def test_extended_types(self):
+        from decimal import Decimal
+
+        buffer = bytearray()
+        value = {"amount": Decimal("9.99"), "items": (1, 2)}
+        typepack.pack_into(value, buffer)
+        assert typepack.unpack(bytes(buffer)) == value
+
+    def test_failure_leaves_buffer_unchanged(self):
+        buffer = bytearray(b"keep")
+        with pytest.raises(TypeError):
+            typepack.pack_into([1, object()], buffer, 4)
+        assert buffer == b"keep"
+
+    def test_failure_releases_buffer(self):
+        buffer = bytearray(b"keep")
+        with pytest.raises(TypeError) as excinfo:
+            typepack.core.pack_into([1, object()], buffer, 2)
+        # The traceback is still alive here; the buffer must be resizable
+        assert excinfo.value is not None
+        buffer.extend(b"x")
+        assert buffer == b"keepx"
+
+    def test_readonly_buffer_raises(self):
+        with pytest.raises(TypeError):
+            typepack.pack_into(1, b"\x00\x00")
+
+    def test_offset_out_of_range(self):
+        with pytest.raises(ValueError, match="offset"):
+            typepack.pack_into(1, bytearray(2), 3)
+
+
+class TestUnpackFromBuffer:
+    """Test deserializing from buffers at an offset."""
+
+    def test_sequential_objects(self):
+        buffer = bytearray()
+        offset = typepack.pack_into({"a": 1}, buffer)
+        typepack.pack_into([b"raw", 2.5], buffer, offset)
+
+        first, offset = typepack.unpack_from_buffer(buffer)
+        second, offset = typepack.unpack_from_buffer(buffer, offset)
+        assert first == {"a": 1}
+        assert second == [b"raw", 2.5]
+        assert type(second[0]) is bytes
+        assert offset == len(buffer)
+
+    def test_memoryview(self):
+        data = b"\x00" + typepack.pack(["é", 300])
+        value, offset = typepack.unpack_from_buffer(memoryview(data), 1)
+        assert value == ["é", 300]
+        assert offset == len(data)
+
+    def test_python_unpack_accepts_buffers(self):
+        data = typepack.core.pack({"name": "Ana", "tags": ["a", b"b"]})
+        for buffer in (bytearray(data), memoryview(data)):
+            assert typepack.core.unpack(buffer) == typepack.core.unpack(data)
+
+    def test_extended_types(self):
+        from datetime import date
+
+        data = typepack.pack({"day": date(2024, 1, 1), "ids": {1, 2}})
+        value, _ = typepack.unpack_from_buffer(bytearray(data))
+        assert value == {"day": date(2024, 1, 1), "ids": {1, 2}}
+
+    def test_offset_out_of_range(self):
+        with pytest.raises(ValueError, match="offset"):
+            typepack.unpack_from_buffer(b"\x01", 2)
+
+    def test_repeated_keys(self):
+        value = [{"id": i, "名前": "x", "k" * 40: None, 1: i} for i in range(3)]
+        result, _ = typepack.unpack_from_buffer(typepack.pack(value))
+        assert result == value
+
+    @pytest.mark.skipif(not typepack.is_accelerated(), reason="C decoder only")
+    def test_repeated_strings_share_objects(self):
+        value = [{"id": i, "tag": "new"} for i in range(10)] + [{"nested": {"id": 0}}]
+        result, _ = typepack.unpack_from_buffer(typepack.pack(value))
+        assert result == value
+        assert next(iter(result[-1]["nested"])) is next(iter(result[-2]))
+        assert result[-2]["tag"] is result[-3]["tag"]
@@ -155,6 +155,21 @@ class TestRegister:
         assert result.amount == 1000
         assert result.currency == "USD"
 
+    def test_register_dict_subclass(self):
+        @typepack.register
+        class Config(dict):
+            def __typepack_encode__(self):
+                return dict(self)
+
+            @classmethod
+            def __typepack_decode__(cls, data):
+                return cls(data)
+
+        result = typepack.unpack(typepack.pack({"config": Config(debug=True)}))
+
+        assert type(result["config"]) is Config
+        assert result["config"] == {"debug": True}
+
     def test_register_dataclass(self):
         @typepack.register
         @dataclass
@@ -1,6 +1,9 @@
 """Tests for typepack streaming features (v0.4.0)."""
 
 import io
+import os
+import subprocess
+import sys
 import tempfile
 import pytest
 from datetime import datetime
@@ -128,6 +131,55 @@ class TestPackStream:
 
         assert result == items
 
+    def test_pack_stream_larger_than_write_chunk(self):
+        items = [{"id": i, "blob": b"x" * 1000} for i in range(200)]
+        buffer = io.BytesIO()
+
+        bytes_written = typepack.pack_stream(items, buffer)
+
+        assert bytes_written == len(buffer.getvalue())
+        buffer.seek(0)
+        assert list(typepack.unpack_stream(buffer)) == items
+
+    def test_pack_stream_failure_keeps_complete_records(self):
+        buffer = io.BytesIO()
+
+        with pytest.raises(TypeError):
+            typepack.pack_stream([{"id": 1}, [2, object()]], buffer)
+
+        buffer.seek(0)
+        assert list(typepack.unpack_stream(buffer)) == [{"id": 1}]
+
+    def test_pack_stream_writer_may_keep_chunks(self):
+        class KeepingWriter:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(data)
+
+        items = [b"x" * 70000, 1, 2]
+        writer = KeepingWriter()
+        typepack.pack_stream(items, writer)
+
+        data = b"".join(bytes(chunk) for chunk in writer.chunks)
+        assert typepack.unpack_many(data) == items
+
+    def test_pack_stream_failed_write_not_retried(self):
+        class FailingWriter:
+            calls = 0
+
+            def write(self, data):
+                self.calls += 1
+                raise OSError("disk full")
+
+        writer = FailingWriter()
+        with pytest.raises(OSError) as excinfo:
+            typepack.pack_stream([b"x" * 70000, 1], writer)
+
+        assert writer.calls == 1
+        assert excinfo.value.__context__ is None
+
 
 class TestUnpackStream:
     """Tests for unpack_stream function."""
@@ -205,6 +257,55 @@ class TestPackMany:
         result = typepack.unpack_many(data)
         assert result == ["hello"]
 
+    def test_pack_many_same_schema_dicts(self):
+        items = [{"id": i, "value": f"item_{i}"} for i in range(100)]
+        data = typepack.pack_many(items)
+        per_record = sum(4 + len(typepack.pack(item)) for item in items)
+
+        assert len(data) < per_record / 2
+        assert typepack.unpack_many(data) == items
+        assert list(typepack.iter_unpack(data)) == items
+
+    def test_pack_many_schema_runs(self):
+        items = (
+            [{"id": i, "at": datetime(2024, 1, i + 1)} for i in range(20)]
+            + [{"at": None, "id": 0}, 5, "text"]
+            + [{"id": i, "ok": i % 2 == 0} for i in range(3)]
+            + [{} for _ in range(16)]
+            + [{1: "int key"} for _ in range(16)]
+        )
+        result = typepack.unpack_many(typepack.pack_many(items))
+
+        assert result == items
+        assert list(result[20]) == ["at", "id"]
+        assert result[23]["ok"] is True
+
+    def test_pack_many_int_columns(self):
+        for high in (200, 60000, 2**32 - 1):
+            items = [{"id": i * (high // 99), "n": -i} for i in range(100)]
+            data = typepack.pack_many(items)
+            assert typepack.unpack_many(data) == items
+            assert list(typepack.iter_unpack(data)) == items
+
+        narrow = typepack.pack_many([{"id": 128 + i} for i in range(100)])
+        wide = typepack.pack_many([{"id": 2**32 + i} for i in range(100)])
+        assert len(narrow) < 120
+        assert typepack.unpack_many(wide) == [{"id": 2**32 + i} for i in range(100)]
+
+    def test_pack_many_int_column_with_outlier(self):
+        items = [{"id": 0} for _ in range(999)] + [{"id": 70000}]
+        data = typepack.pack_many(items)
+
+        # One large item keeps the column a plain list, not a 4-byte array
+        assert len(data) < 1100
+        assert typepack.unpack_many(data) == items
+
+    def test_pack_many_table_record_through_stream(self):
+        items = [{"id": i} for i in range(32)]
+        buffer = io.BytesIO(typepack.pack_many(items))
+
+        assert list(typepack.unpack_stream(buffer)) == items
+
 
 class TestUnpackMany:
     """Tests for unpack_many function."""
@@ -229,6 +330,132 @@ class TestUnpackMany:
         assert result[1]["amount"] == items[1]["amount"]
         assert result[2]["tags"] == items[2]["tags"]
 
+    def test_unpack_many_basic_and_extended_records(self):
+        items = [
+            {"id": 1, "value": "item_1"},
+            {"id": 2, "at": datetime(2024, 1, 1)},
+            {"id": 3, "value": b"raw"},
+        ]
+        data = typepack.pack_many(items)
+        assert typepack.unpack_many(data) == items
+
+    def test_unpack_many_table_with_extended_values(self):
+        items = [{"id": i, "at": datetime(2024, 1, 1)} for i in range(20)]
+        items += [{"id": i, "value": f"item_{i}"} for i in range(20)]
+        data = typepack.pack_many(items + [Decimal("1.5")])
+
+        assert typepack.unpack_many(data) == items + [Decimal("1.5")]
+
+    def test_unpack_many_accepts_buffers(self):
+        items = [{"id": i} for i in range(20)] + [b"raw"]
+        data = typepack.pack_many(items)
+
+        assert typepack.unpack_many(bytearray(data)) == items
+        assert typepack.unpack_many(memoryview(data)) == items
+
+    def test_unpack_many_truncated_raises(self):
+        data = typepack.pack_many([{"id": i} for i in range(20)])
+
+        with pytest.raises(ValueError):
+            typepack.unpack_many(data[:2])
+        with pytest.raises(ValueError):
+            typepack.unpack_many(data[:-1])
+
+    def test_unpack_many_malformed_table_raises(self):
+        payloads = [
+            [2, 5, [1, 2]],
+            [2, ["id"], 7],
+            [2, [["id"]], [1, 2]],
+            [2, [1], [1, 2]],
+            ["2", ["id"], [1, 2]],
+        ]
+        for payload in payloads:
+            body = typepack.core.pack(payload)
+            block = bytes([0xC7, len(body), 0x0E]) + body
+            record = len(block).to_bytes(4, "big") + block
+
+            with pytest.raises(ValueError):
+                typepack.unpack(block)
+            with pytest.raises(ValueError):
+                typepack.unpack_many(record)
+            with pytest.raises(ValueError):
+                typepack.unpack_many_lazy(record)[0]
+
+
+class TestUnpackManyLazy:
+    """Tests for unpack_many_lazy function."""
+
+    def test_unpack_many_lazy_random_access(self):
+        items = [1, "two", {"at": datetime(2024, 1, 1)}, Decimal("4")]
+        records = typepack.unpack_many_lazy(typepack.pack_many(items))
+
+        assert len(records) == 4
+        assert records[2] == items[2]
+        assert records[-1] == items[-1]
+        assert records[1:3] == items[1:3]
+        assert list(records) == items
+        with pytest.raises(IndexError):
+            records[4]
+
+    def test_unpack_many_lazy_table_rows(self):
+        items = [{"id": i, "value": f"item_{i}"} for i in range(40)] + [None]
+        items += [{"id": i} for i in range(300)]
+        records = typepack.unpack_many_lazy(typepack.pack_many(items))
+
+        assert len(records) == len(items)
+        assert records[340] == items[340]
+        assert records[40] is None
+        assert records[5] == items[5]
+        assert [records[i] for i in range(len(items))] == items
+        assert list(records) == items
+
+    def test_unpack_many_lazy_indexes_stream_output(self):
+        buffer = io.BytesIO()
+        typepack.pack_stream(range(5), buffer)
+        records = typepack.unpack_many_lazy(buffer.getvalue())
+
+        assert list(records) == [0, 1, 2, 3, 4]
+        assert len(typepack.unpack_many_lazy(b"")) == 0
+
+    def test_unpack_many_lazy_truncated_raises(self):
+        data = typepack.pack_many([{"id": i} for i in range(20)] + [1])
+
+        with pytest.raises(ValueError):
+            typepack.unpack_many_lazy(data[:-1])
+        with pytest.raises(ValueError):
+            typepack.unpack_many_lazy(data + b"\x00")
+
+    def test_unpack_many_lazy_invalid_row_count_raises(self, monkeypatch):
+        # Row counts that aren't a uint: a map with an unhashable key, an
+        # int64, and a uint16 cut off by the end of the record
+        for body in (b"\x93\x81\x90\x01", b"\x93\xd3" + bytes(8), b"\x93\xcd\x01"):
+            block = bytes([0xC7, len(body), 0x0E]) + body
+            record = len(block).to_bytes(4, "big") + block
+            with pytest.raises(ValueError, match="Invalid table block"):
+                typepack.unpack_many_lazy(record)
+            monkeypatch.setattr(typepack.stream, "_c_index_many", None)
+            with pytest.raises(ValueError, match="Invalid table block"):
+                typepack.unpack_many_lazy(record)
+            monkeypatch.undo()
+
+    def test_unpack_many_lazy_non_integer_index_raises(self):
+        records = typepack.unpack_many_lazy(typepack.pack_many([1, 2, 3]))
+
+        for index in ("a", 1.5, None):
+            with pytest.raises(TypeError):
+                records[index]
+
+    def test_unpack_many_lazy_object_identity(self):
+        items = [{"id": i} for i in range(20)] + [{"single": True}]
+        records = typepack.unpack_many_lazy(typepack.pack_many(items))
+
+        # Table rows and separate records alike are decoded once
+        assert records[20] is records[20]
+        assert records[3] is records[3]
+        records[3]["id"] = -1
+        assert list(records)[3] is records[3]
+        assert [row.get("id") for row in records][:4] == [0, 1, 2, -1]
+
 
 class TestIterUnpack:
     """Tests for iter_unpack function."""
@@ -301,3 +528,24 @@ class TestStreamRoundtrip:
         result = typepack.unpack_many(data)
 
         assert result == items
+
+
+class TestLazyImport:
+    """Tests for loading typepack.stream on first use."""
+
+    def test_stream_loaded_on_first_access(self):
+        code = (
+            "import sys, typepack\n"
+            "assert 'typepack.stream' not in sys.modules\n"
+            "from typepack import pack_many\n"
+            "assert 'typepack.stream' in sys.modules\n"
+            "assert typepack.unpack_many(pack_many([1])) == [1]\n"
+        )
+        root = os.path.dirname(os.path.dirname(typepack.__file__))
+        env = dict(os.environ, PYTHONPATH=root)
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+    def test_exports_listed(self):
+        assert "iter_unpack" in dir(typepack)
+        with pytest.raises(AttributeError):
+            typepack.missing_function
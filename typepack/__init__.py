@@ -45,6 +45,10 @@ _HAS_PYBYTESWRITER = False
 
 try:
     from typepack._typepack import pack as _c_pack, unpack as _c_unpack
+    from typepack._typepack import (
+        pack_into as _c_pack_into,
+        unpack_from_buffer as _c_unpack_from_buffer,
+    )
     from typepack._typepack import has_pybyteswriter as _has_pybyteswriter
     _USE_C_EXTENSION = True
     _HAS_PYBYTESWRITER = _has_pybyteswriter()
@@ -53,16 +57,38 @@ except ImportError:
 
 # Import pure Python implementation
 from typepack.core import pack as _py_pack, unpack as _py_unpack
-from typepack.types import register, clear_registry
-from typepack.stream import (
-    pack_to,
-    unpack_from,
-    pack_stream,
-    unpack_stream,
-    pack_many,
-    unpack_many,
-    iter_unpack,
+from typepack.core import (
+    pack_into as _py_pack_into,
+    unpack_from_buffer as _py_unpack_from_buffer,
 )
+from typepack.types import register, clear_registry
+
+# Streaming functions are imported from typepack.stream on first access
+# (PEP 562), so `import typepack` doesn't load it for pack/unpack only use
+_STREAM_EXPORTS = frozenset((
+    "pack_to",
+    "unpack_from",
+    "pack_stream",
+    "unpack_stream",
+    "pack_many",
+    "unpack_many",
+    "unpack_many_lazy",
+    "iter_unpack",
+))
+
+
+def __getattr__(name):
+    if name in _STREAM_EXPORTS:
+        from typepack import stream
+
+        value = getattr(stream, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _STREAM_EXPORTS)
 
 
 def is_accelerated() -> bool:
@@ -76,30 +102,22 @@ def has_pybyteswriter() -> bool:
 
 
 # Select implementation
-# For basic types (int, float, str, bytes, list, dict, bool, None),
-# use C extension if available
-# For extended types (datetime, Decimal, etc.), always use Python
-# implementation since C extension doesn't support them yet
+# The C functions take basic types (int, float, str, bytes, list, dict,
+# bool, None) themselves and hand extended types (datetime, Decimal,
+# etc.) or data they can't decode to the Python implementation, so they
+# are bound directly: a call doesn't go through a Python wrapper.
+# Without PyBytesWriter (Python < 3.15) the C pack functions only defer
+# to Python, so the Python ones are bound instead.
 
 if _USE_C_EXTENSION:
-    def pack(obj):
-        """
-        Serialize a Python object to binary format.
-
-        Uses C extension for basic types, falls back to Python for extended types.
-        """
-        # For now, always use Python for full type support
-        # C extension will be used for basic types in hot paths
-        return _py_pack(obj)
-
-    def unpack(data):
-        """
-        Deserialize binary data to a Python object.
-
-        Uses C extension for basic types, falls back to Python for extended types.
-        """
-        # For now, always use Python for full type support
-        return _py_unpack(data)
+    if _HAS_PYBYTESWRITER:
+        pack = _c_pack
+        pack_into = _c_pack_into
+    else:
+        pack = _py_pack
+        pack_into = _py_pack_into
+    unpack = _c_unpack
+    unpack_from_buffer = _c_unpack_from_buffer
 
     # Export C functions for direct access
     pack_basic = _c_pack
@@ -107,15 +125,19 @@ if _USE_C_EXTENSION:
 else:
     pack = _py_pack
     unpack = _py_unpack
+    pack_into = _py_pack_into
+    unpack_from_buffer = _py_unpack_from_buffer
     pack_basic = _py_pack
     unpack_basic = _py_unpack
 
 
-__version__ = "0.6.0"
+__version__ = "0.6.1"
 __all__ = [
     # Core functions
     "pack",
     "unpack",
+    "pack_into",
+    "unpack_from_buffer",
     # Basic type functions (C accelerated when available)
     "pack_basic",
     "unpack_basic",
@@ -129,6 +151,7 @@ __all__ = [
     "unpack_stream",
     "pack_many",
     "unpack_many",
+    "unpack_many_lazy",
     "iter_unpack",
     # Introspection
     "is_accelerated",
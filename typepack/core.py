@@ -32,6 +32,8 @@ _BYTES_FALSE = bytes([0xC2])
 _BYTES_TRUE = bytes([0xC3])
 _BYTES_FLOAT64 = bytes([0xCB])
 
+_INT_TYPE_SET = {int}
+
 
 # Format markers (MessagePack compatible)
 _NONE = 0xC0
@@ -82,6 +84,11 @@ _EXT_ENUM = 0x0A
 _EXT_DATACLASS = 0x0B
 _EXT_NAMEDTUPLE = 0x0C
 _EXT_CUSTOM = 0x0D  # For registered custom types
+_EXT_TABLE = 0x0E  # Columnar block of same-schema dicts (pack_many)
+_EXT_INT_ARRAY = 0x0F  # Fixed-width unsigned int column in a table block
+
+# struct codes for _EXT_INT_ARRAY item widths, in bytes
+_INT_ARRAY_FORMATS = {1: "B", 2: "H", 4: "I"}
 
 
 def pack(obj: Any) -> bytes:
@@ -122,12 +129,110 @@ def unpack(data: bytes) -> Any:
     Raises:
         ValueError: If the data format is invalid.
     """
-    result, _ = _unpack_value(data, 0)
+    result, _ = _unpack_value(_as_bytes(data), 0)
     return result
 
 
+def pack_into(obj: Any, buffer: bytearray, offset: int = 0) -> int:
+    """
+    Serialize a Python object into an existing buffer.
+
+    The encoded bytes overwrite the buffer starting at offset. A bytearray
+    is extended as needed; any other writable buffer must be large enough.
+    Reusing one buffer across calls avoids allocating a bytes object per
+    call.
+
+    Args:
+        obj: The Python object to serialize.
+        buffer: A bytearray or other writable buffer.
+        offset: Position in buffer to start writing at.
+
+    Returns:
+        The offset just past the written data.
+
+    Raises:
+        TypeError: If the object type is not supported.
+        ValueError: If offset is out of range or buffer is too small.
+    """
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError("pack_into() argument must be a writable buffer")
+    if not 0 <= offset <= view.nbytes:
+        raise ValueError("offset out of range")
+
+    if isinstance(buffer, bytearray) and offset == len(buffer):
+        # Appending: encode straight into the caller's bytearray
+        view.release()
+        try:
+            _pack_value(obj, buffer)
+        except BaseException:
+            del buffer[offset:]
+            raise
+        return len(buffer)
+
+    try:
+        data = bytearray()
+        _pack_value(obj, data)
+        end = offset + len(data)
+
+        if isinstance(buffer, bytearray):
+            view.release()
+            buffer[offset:end] = data
+        else:
+            if end > view.nbytes:
+                raise ValueError(
+                    f"Buffer too small: need {end} bytes, have {view.nbytes}"
+                )
+            view.cast("B")[offset:end] = data
+    finally:
+        # An exception traceback must not keep the buffer exported
+        view.release()
+    return end
+
+
+def unpack_from_buffer(buffer: bytes, offset: int = 0) -> tuple[Any, int]:
+    """
+    Deserialize one object from a buffer at the given offset.
+
+    Accepts bytes, bytearray, memoryview or any other object supporting
+    the buffer protocol. bytes and bytearray are read in place; other
+    buffers are copied to bytes once.
+
+    Args:
+        buffer: Binary data to read from.
+        offset: Position of the object in buffer.
+
+    Returns:
+        A tuple of (object, offset just past the object).
+
+    Raises:
+        ValueError: If the data format is invalid.
+    """
+    data = _as_bytes(buffer)
+    if not 0 <= offset <= len(data):
+        raise ValueError("offset out of range")
+    return _unpack_value(data, offset)
+
+
+def _as_bytes(data: bytes) -> bytes:
+    """Return data as bytes unless it already is bytes or a bytearray.
+
+    The decoder slices its input and decodes str values with
+    bytes.decode, which memoryviews and other buffers don't have.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    return memoryview(data).tobytes()
+
+
 def _pack_value(obj: Any, buffer: bytearray) -> None:
     """Pack a single value into the buffer."""
+    # Exact built-in types skip the isinstance chain below
+    packer = _EXACT_PACKERS.get(type(obj))
+    if packer is not None:
+        packer(obj, buffer)
+        return
+
     # Local references for faster access
     _extend = buffer.extend
     _append = buffer.append
@@ -203,6 +308,16 @@ def _pack_value(obj: Any, buffer: bytearray) -> None:
         raise TypeError(f"Unsupported type: {type(obj).__name__}")
 
 
+def _pack_none(value: None, buffer: bytearray) -> None:
+    """Pack None."""
+    buffer.append(_NONE)
+
+
+def _pack_bool(value: bool, buffer: bytearray) -> None:
+    """Pack a bool value."""
+    buffer.append(_TRUE if value else _FALSE)
+
+
 def _pack_int(value: int, buffer: bytearray) -> None:
     """Pack an integer value."""
     if 0 <= value <= 127:
@@ -281,10 +396,8 @@ def _pack_bytes(value: bytes, buffer: bytearray) -> None:
     buffer.extend(value)
 
 
-def _pack_list(value: list, buffer: bytearray) -> None:
-    """Pack a list value."""
-    length = len(value)
-
+def _pack_array_header(length: int, buffer: bytearray) -> None:
+    """Pack the header of an array with length items."""
     if length <= 15:
         # Fixarray
         buffer.append(0x90 | length)
@@ -295,12 +408,53 @@ def _pack_list(value: list, buffer: bytearray) -> None:
         buffer.append(_ARRAY32)
         buffer.extend(_STRUCT_UINT32.pack(length))
 
+
+def _pack_list(value: list, buffer: bytearray) -> None:
+    """Pack a list value."""
+    length = len(value)
+    _pack_array_header(length, buffer)
+
+    # Batch path: a list of ints in 0-127 encodes as one positive fixint
+    # byte per item, which is exactly what bytes(value) produces.
+    if length and type(value[0]) is int:
+        encoded = _pack_fixint_run(value)
+        if encoded is not None:
+            buffer.extend(encoded)
+            return
+
     for item in value:
         _pack_value(item, buffer)
 
 
+def _pack_fixint_run(value: list) -> bytes | None:
+    """Return the fixint encoding of value, or None if any item is not a fixint."""
+    try:
+        encoded = bytes(value)
+    except (TypeError, ValueError):
+        return None
+    # bytes() also accepts bool and other __index__ types, which have
+    # their own markers, so require plain ints only.
+    if encoded.isascii() and set(map(type, value)) == _INT_TYPE_SET:
+        return encoded
+    return None
+
+
 def _pack_dict(value: dict, buffer: bytearray) -> None:
-    """Pack a dict value."""
+    """Pack a dict value, using a specialized encoder for repeated schemas."""
+    if len(value) > _SCHEMA_MAX_KEYS:
+        _pack_dict_items(value, buffer)
+        return
+
+    # Key types too: str subclass keys (str-mixin Enums) equal plain ones
+    schema = (tuple(value), tuple(map(type, value)), tuple(map(type, value.values())))
+    encoder = _schema_encoders.get(schema)
+    if encoder is None:
+        encoder = _schema_encoder_for(schema)
+    encoder(value, buffer)
+
+
+def _pack_dict_items(value: dict, buffer: bytearray) -> None:
+    """Pack a dict value item by item."""
     length = len(value)
 
     if length <= 15:
@@ -318,6 +472,114 @@ def _pack_dict(value: dict, buffer: bytearray) -> None:
         _pack_value(v, buffer)
 
 
+# Dict schema specialization: a schema is the key tuple plus the exact
+# type of each key and each value. The second time a schema is packed, an
+# encoder is generated for it. The encoder writes the map header and the
+# encoded keys as precomputed constants, and inlines the common value
+# encodings. Dicts with more than _SCHEMA_MAX_KEYS keys or non-str keys,
+# and new schemas once the cache is full, use _pack_dict_items; schemas
+# with non-str keys are cached as such.
+_SCHEMA_MAX_KEYS = 32
+_SCHEMA_CACHE_SIZE = 256
+_schema_encoders: dict[tuple, Any] = {}
+_schemas_seen: set[tuple] = set()
+
+# Source templates for inlined value encodings; {v} is the value variable
+_INLINE_VALUE_PACKERS = {
+    bool: ("buffer.append(0xC3 if {v} else 0xC2)",),
+    int: (
+        "if 0 <= {v} <= 0x7F:",
+        "    buffer.append({v})",
+        "else:",
+        "    _pack_int({v}, buffer)",
+    ),
+    str: (
+        "{e} = {v}.encode('utf-8')",
+        "if len({e}) <= 31:",
+        "    buffer.append(0xA0 | len({e}))",
+        "    buffer += {e}",
+        "else:",
+        "    _pack_str({v}, buffer)",
+    ),
+}
+
+
+def _schema_encoder_for(schema: tuple) -> Any:
+    """Return the encoder for a schema not yet cached, caching it if useful."""
+    keys, key_types, value_types = schema
+    if len(_schema_encoders) >= _SCHEMA_CACHE_SIZE:
+        return _pack_dict_items
+    if not all(key_type is str for key_type in key_types):
+        _schema_encoders[schema] = _pack_dict_items
+        return _pack_dict_items
+    if schema not in _schemas_seen:
+        # Seen once: compiling costs more than packing a one-off dict
+        if len(_schemas_seen) >= 4 * _SCHEMA_CACHE_SIZE:
+            _schemas_seen.clear()
+        _schemas_seen.add(schema)
+        return _pack_dict_items
+
+    encoder = _compile_schema_encoder(keys, value_types)
+    _schema_encoders[schema] = encoder
+    return encoder
+
+
+def _compile_schema_encoder(keys: tuple, value_types: tuple) -> Any:
+    """Generate an encoder for dicts with these str keys and value types.
+
+    Keys and other data only reach the generated code as namespace
+    constants (_c0, _c1, ...), never as source text.
+    """
+    namespace = {
+        "_pack_int": _pack_int,
+        "_pack_str": _pack_str,
+        "_pack_float64": _STRUCT_FLOAT64.pack,
+    }
+    body = []
+    pending = bytearray()
+    if len(keys) <= 15:
+        pending.append(0x80 | len(keys))
+    else:
+        pending.append(_MAP16)
+        pending.extend(_STRUCT_UINT16.pack(len(keys)))
+
+    def flush() -> None:
+        if pending:
+            name = f"_c{len(namespace)}"
+            namespace[name] = bytes(pending)
+            body.append(f"buffer += {name}")
+            pending.clear()
+
+    for index, (key, value_type) in enumerate(zip(keys, value_types)):
+        _pack_str(key, pending)
+        v = f"v{index}"
+        if value_type is type(None):
+            pending.append(_NONE)
+            continue
+        if value_type is float:
+            pending.append(_FLOAT64)
+            flush()
+            body.append(f"buffer += _pack_float64({v})")
+            continue
+
+        flush()
+        template = _INLINE_VALUE_PACKERS.get(value_type)
+        if template is not None:
+            body.extend(line.format(v=v, e=f"e{index}") for line in template)
+        else:
+            packer = f"_p{index}"
+            namespace[packer] = _EXACT_PACKERS.get(value_type, _pack_value)
+            body.append(f"{packer}({v}, buffer)")
+    flush()
+
+    lines = ["def _encode(obj, buffer):"]
+    if keys:
+        lines.append("    " + "".join(f"v{i}, " for i in range(len(keys))) + "= obj.values()")
+    lines.extend("    " + line for line in body)
+    exec("\n".join(lines), namespace)
+    return namespace["_encode"]
+
+
 def _pack_ext(type_code: int, data: bytes, buffer: bytearray) -> None:
     """Pack an extension type value."""
     length = len(data)
@@ -478,6 +740,67 @@ def _pack_registered(value: Any, buffer: bytearray) -> None:
     _pack_ext(_EXT_CUSTOM, bytes(items_buffer), buffer)
 
 
+def _pack_table(rows: list, keys: tuple, buffer: bytearray) -> None:
+    """Pack dicts that all have ``keys``, in that order, as one columnar block.
+
+    The payload is an array of the row count, the (non-empty) key list,
+    and one column per key, so each key is written once and each column
+    packs as a plain list or, for wider unsigned ints, a fixed-width
+    int array.
+    """
+    columns = [list(column) for column in zip(*[row.values() for row in rows])]
+    items_buffer = bytearray()
+    _pack_array_header(2 + len(columns), items_buffer)
+    _pack_int(len(rows), items_buffer)
+    _pack_list(list(keys), items_buffer)
+    for column in columns:
+        _pack_column(column, items_buffer)
+    _pack_ext(_EXT_TABLE, bytes(items_buffer), buffer)
+
+
+def _pack_column(column: list, buffer: bytearray) -> None:
+    """Pack a table column, as a fixed-width int array when that is smaller.
+
+    Unsigned ints up to 127 are already one byte each as fixints, so only
+    columns reaching past that can switch to 1, 2 or 4 bytes per item. The
+    width comes from the largest item, so the array is only used when it
+    beats the uint encoding of the same items.
+    """
+    if type(column[0]) is int and set(map(type, column)) == _INT_TYPE_SET:
+        high = max(column)
+        if 0x7F < high <= 0xFFFFFFFF and min(column) >= 0:
+            width = 1 if high <= 0xFF else 2 if high <= 0xFFFF else 4
+            # As uints: 1 byte up to 0x7F, then 2, 3 or 5 bytes
+            plain = len(column) + sum(
+                (item > 0x7F) + (item > 0xFF) + 2 * (item > 0xFFFF)
+                for item in column
+            )
+            if 1 + width * len(column) < plain:
+                if width == 1:
+                    data = b"\x01" + bytes(column)
+                else:
+                    fmt = f">B{len(column)}{_INT_ARRAY_FORMATS[width]}"
+                    data = struct.pack(fmt, width, *column)
+                _pack_ext(_EXT_INT_ARRAY, data, buffer)
+                return
+    _pack_list(column, buffer)
+
+
+# Packers keyed by exact type, for the hot built-in types. Subclasses
+# (IntEnum, NamedTuple, registered types, ...) miss this table and go
+# through the full isinstance chain in _pack_value.
+_EXACT_PACKERS = {
+    type(None): _pack_none,
+    bool: _pack_bool,
+    int: _pack_int,
+    float: _pack_float,
+    str: _pack_str,
+    bytes: _pack_bytes,
+    list: _pack_list,
+    dict: _pack_dict,
+}
+
+
 def _unpack_value(data: bytes, offset: int) -> tuple[Any, int]:
     """Unpack a single value from the data at the given offset."""
     if offset >= len(data):
@@ -523,15 +846,15 @@ def _unpack_value(data: bytes, offset: int) -> tuple[Any, int]:
     if marker == _BIN8:
         length = data[offset]
         offset += 1
-        return data[offset:offset + length], offset + length
+        return bytes(data[offset:offset + length]), offset + length
     if marker == _BIN16:
         length = _STRUCT_UINT16.unpack_from(data, offset)[0]
         offset += 2
-        return data[offset:offset + length], offset + length
+        return bytes(data[offset:offset + length]), offset + length
     if marker == _BIN32:
         length = _STRUCT_UINT32.unpack_from(data, offset)[0]
         offset += 4
-        return data[offset:offset + length], offset + length
+        return bytes(data[offset:offset + length]), offset + length
 
     # Float
     if marker == _FLOAT32:
@@ -606,40 +929,40 @@ def _unpack_value(data: bytes, offset: int) -> tuple[Any, int]:
     if marker == _FIXEXT1:
         type_code = data[offset]
         offset += 1
-        return _unpack_ext(type_code, data[offset:offset + 1]), offset + 1
+        return _unpack_ext(type_code, bytes(data[offset:offset + 1])), offset + 1
     if marker == _FIXEXT2:
         type_code = data[offset]
         offset += 1
-        return _unpack_ext(type_code, data[offset:offset + 2]), offset + 2
+        return _unpack_ext(type_code, bytes(data[offset:offset + 2])), offset + 2
     if marker == _FIXEXT4:
         type_code = data[offset]
         offset += 1
-        return _unpack_ext(type_code, data[offset:offset + 4]), offset + 4
+        return _unpack_ext(type_code, bytes(data[offset:offset + 4])), offset + 4
     if marker == _FIXEXT8:
         type_code = data[offset]
         offset += 1
-        return _unpack_ext(type_code, data[offset:offset + 8]), offset + 8
+        return _unpack_ext(type_code, bytes(data[offset:offset + 8])), offset + 8
     if marker == _FIXEXT16:
         type_code = data[offset]
         offset += 1
-        return _unpack_ext(type_code, data[offset:offset + 16]), offset + 16
+        return _unpack_ext(type_code, bytes(data[offset:offset + 16])), offset + 16
 
     # Extension types (ext8/16/32)
     if marker == _EXT8:
         length = data[offset]
         type_code = data[offset + 1]
         offset += 2
-        return _unpack_ext(type_code, data[offset:offset + length]), offset + length
+        return _unpack_ext(type_code, bytes(data[offset:offset + length])), offset + length
     if marker == _EXT16:
         length = _STRUCT_UINT16.unpack_from(data, offset)[0]
         type_code = data[offset + 2]
         offset += 3
-        return _unpack_ext(type_code, data[offset:offset + length]), offset + length
+        return _unpack_ext(type_code, bytes(data[offset:offset + length])), offset + length
     if marker == _EXT32:
         length = _STRUCT_UINT32.unpack_from(data, offset)[0]
         type_code = data[offset + 4]
         offset += 5
-        return _unpack_ext(type_code, data[offset:offset + length]), offset + length
+        return _unpack_ext(type_code, bytes(data[offset:offset + length])), offset + length
 
     raise ValueError(f"Unknown format marker: 0x{marker:02X}")
 
@@ -652,6 +975,14 @@ def _unpack_str(data: bytes, offset: int, length: int) -> tuple[str, int]:
 
 def _unpack_array(data: bytes, offset: int, length: int) -> tuple[list, int]:
     """Unpack an array value."""
+    # Batch path: if the next `length` bytes are all positive fixints
+    # (0x00-0x7F), each one is a complete item.
+    if length and offset < len(data) and data[offset] <= 0x7F:
+        end = offset + length
+        chunk = bytes(data[offset:end])
+        if len(chunk) == length and chunk.isascii():
+            return list(chunk), end
+
     result = []
     for _ in range(length):
         item, offset = _unpack_value(data, offset)
@@ -731,6 +1062,13 @@ def _unpack_ext(type_code: int, data: bytes) -> Any:
             **nt_data,
         }
 
+    if type_code == _EXT_TABLE:
+        table, _ = _unpack_value(data, 0)
+        return _unpack_table(table)
+
+    if type_code == _EXT_INT_ARRAY:
+        return _unpack_int_array(data)
+
     if type_code == _EXT_CUSTOM:
         custom_data, _ = _unpack_value(data, 0)
         registered_type_code = custom_data["__type_code__"]
@@ -749,3 +1087,31 @@ def _unpack_ext(type_code: int, data: bytes) -> Any:
         }
 
     raise ValueError(f"Unknown extension type: {type_code}")
+
+
+def _unpack_table(table: list) -> list[dict]:
+    """Rebuild the rows of a columnar block written by _pack_table."""
+    if type(table) is not list or len(table) < 2:
+        raise ValueError("Invalid table block")
+    count, keys, columns = table[0], table[1], table[2:]
+    if type(count) is not int or type(keys) is not list:
+        raise ValueError("Invalid table block")
+    if not keys or len(columns) != len(keys):
+        raise ValueError("Invalid table block")
+    # pack_many only writes str keys; anything else could be unhashable
+    if any(type(key) is not str for key in keys):
+        raise ValueError("Invalid table block")
+    if any(type(column) is not list or len(column) != count for column in columns):
+        raise ValueError("Invalid table block")
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def _unpack_int_array(data: bytes) -> list[int]:
+    """Unpack a fixed-width int column: a width byte, then big-endian items."""
+    width = data[0] if data else 0
+    if width not in _INT_ARRAY_FORMATS or (len(data) - 1) % width:
+        raise ValueError("Invalid int array")
+    if width == 1:
+        return list(data[1:])
+    count = (len(data) - 1) // width
+    return list(struct.unpack_from(f">{count}{_INT_ARRAY_FORMATS[width]}", data, 1))
@@ -5,10 +5,154 @@ Provides functions to serialize/deserialize multiple objects
 to/from file-like objects or iterators.
 """
 
+import operator
 import struct
+from bisect import bisect_right
+from collections.abc import Sequence
 from typing import Any, BinaryIO, Iterator, Iterable
 
-from typepack.core import pack, _unpack_value
+from typepack.core import (
+    pack,
+    _as_bytes,
+    _pack_table,
+    _pack_value,
+    _unpack_value,
+    _STRUCT_UINT32,
+    _ARRAY16,
+    _ARRAY32,
+    _UINT8,
+    _UINT16,
+    _UINT32,
+    _EXT8,
+    _EXT16,
+    _EXT32,
+    _EXT_TABLE,
+)
+
+try:
+    from typepack._typepack import unpack as _c_unpack
+    from typepack._typepack import unpack_many as _c_unpack_many
+    from typepack._typepack import index_many as _c_index_many
+except ImportError:
+    _c_unpack = None
+    _c_unpack_many = None
+    _c_index_many = None
+
+# Runs of at least this many same-schema dicts are packed as one
+# columnar table block by pack_many.
+_TABLE_MIN_ROWS = 16
+
+# Payload sizes of the uint markers a table block's row count may use
+_ROW_COUNT_SIZES = {_UINT8: 1, _UINT16: 2, _UINT32: 4}
+
+# pack_stream buffers records and writes once this many bytes are pending
+_WRITE_CHUNK_SIZE = 64 * 1024
+_EMPTY_LENGTH = bytes(4)
+
+
+def _unpack_record(data: bytes, offset: int, length: int) -> Any:
+    """Deserialize one length-prefixed record, preferring the C decoder."""
+    if _c_unpack is not None:
+        # Hands extension types to the Python implementation itself
+        return _c_unpack(memoryview(data)[offset:offset + length])
+    result, _ = _unpack_value(data, offset)
+    return result
+
+
+def _is_table_record(data: bytes, offset: int, length: int) -> bool:
+    """Check whether a length-prefixed record is a pack_many table block."""
+    if length < 3:
+        return False
+    marker = data[offset]
+    if marker == _EXT8:
+        type_offset = offset + 2
+    elif marker == _EXT16:
+        type_offset = offset + 3
+    elif marker == _EXT32:
+        type_offset = offset + 5
+    else:
+        return False
+    return type_offset < offset + length and data[type_offset] == _EXT_TABLE
+
+
+def _unpack_records(data: bytes, offset: int, length: int) -> Iterator[Any]:
+    """Yield the objects stored in one record, expanding table blocks."""
+    if _is_table_record(data, offset, length):
+        rows, _ = _unpack_value(data, offset)
+        yield from rows
+    else:
+        yield _unpack_record(data, offset, length)
+
+
+def _unpack_record_objects(data: bytes, offset: int, length: int) -> list[Any]:
+    """Decode one record in Python; the C unpack_many fallback."""
+    if not isinstance(data, (bytes, bytearray)):
+        # Copy just this record out of a memoryview or other buffer
+        data = _as_bytes(memoryview(data)[offset:offset + length])
+        offset = 0
+    result, _ = _unpack_value(data, offset)
+    if _is_table_record(data, offset, length):
+        return result
+    return [result]
+
+
+def _table_row_count(data: bytes, offset: int, length: int) -> int:
+    """Read the row count of a table block without decoding its columns."""
+    end = offset + length
+    marker = data[offset]
+    if marker == _EXT8:
+        position = offset + 3
+    elif marker == _EXT16:
+        position = offset + 4
+    else:
+        position = offset + 6
+
+    # Skip the header of the [row count, keys, column...] array
+    marker = data[position] if position < end else None
+    if marker is not None and 0x90 <= marker <= 0x9F:
+        position += 1
+    elif marker == _ARRAY16:
+        position += 3
+    elif marker == _ARRAY32:
+        position += 5
+    else:
+        raise ValueError("Invalid table block")
+
+    # The row count, as _pack_int writes a non-negative int
+    marker = data[position] if position < end else None
+    if marker is not None and marker <= 0x7F:
+        rows = marker
+    else:
+        size = _ROW_COUNT_SIZES.get(marker)
+        if size is None or position + 1 + size > end:
+            raise ValueError("Invalid table block")
+        rows = int.from_bytes(data[position + 1:position + 1 + size], "big")
+    # Every row takes at least a byte of each column
+    if rows > length:
+        raise ValueError("Invalid table block")
+    return rows
+
+
+def _table_run_end(items: list, start: int) -> int:
+    """Return the end of the run of dicts sharing items[start]'s keys."""
+    first = items[start]
+    if type(first) is not dict:
+        return start + 1
+    keys = tuple(first)
+    if not keys:
+        return start + 1
+    # Only str keys: 1, 1.0 and True compare equal but pack differently
+    for key in keys:
+        if type(key) is not str:
+            return start + 1
+
+    end = start + 1
+    while end < len(items):
+        item = items[end]
+        if type(item) is not dict or len(item) != len(keys) or tuple(item) != keys:
+            break
+        end += 1
+    return end
 
 
 def pack_to(obj: Any, file: BinaryIO) -> int:
@@ -60,7 +204,10 @@ def pack_stream(objects: Iterable[Any], file: BinaryIO) -> int:
     Serialize multiple objects to a file-like object.
 
     Each object is prefixed with its length (4 bytes, big-endian)
-    to allow reading them back individually.
+    to allow reading them back individually. Records are buffered and
+    written in chunks of about 64 KiB, so file only sees a record once
+    that much has built up or the objects run out. If an object fails
+    to encode, the records before it are still written.
 
     Args:
         objects: An iterable of Python objects to serialize.
@@ -75,13 +222,34 @@ def pack_stream(objects: Iterable[Any], file: BinaryIO) -> int:
         ...     typepack.pack_stream(items, f)
     """
     total_bytes = 0
-    for obj in objects:
-        data = pack(obj)
-        # Write length prefix (4 bytes, big-endian)
-        length_prefix = struct.pack(">I", len(data))
-        file.write(length_prefix)
-        file.write(data)
-        total_bytes += 4 + len(data)
+    buffer = bytearray()
+    try:
+        for obj in objects:
+            start = len(buffer)
+            # Reserve the length prefix, encode after it, then fill it in
+            buffer.extend(_EMPTY_LENGTH)
+            try:
+                _pack_value(obj, buffer)
+            except BaseException:
+                del buffer[start:]
+                raise
+            _STRUCT_UINT32.pack_into(buffer, start, len(buffer) - start - 4)
+
+            if len(buffer) >= _WRITE_CHUNK_SIZE:
+                # Start a new buffer: the file may keep the one it is given
+                chunk, buffer = buffer, bytearray()
+                file.write(chunk)
+                total_bytes += len(chunk)
+    except BaseException:
+        # Records encoded before an encode error are still written. After
+        # a failed write the buffer is empty, so nothing is written again.
+        if buffer:
+            file.write(buffer)
+        raise
+
+    if buffer:
+        file.write(buffer)
+        total_bytes += len(buffer)
     return total_bytes
 
 
@@ -119,8 +287,7 @@ def unpack_stream(file: BinaryIO) -> Iterator[Any]:
         if len(data) < length:
             raise ValueError("Unexpected end of stream while reading data")
 
-        result, _ = _unpack_value(data, 0)
-        yield result
+        yield from _unpack_records(data, 0, length)
 
 
 def iter_unpack(data: bytes) -> Iterator[Any]:
@@ -141,6 +308,7 @@ def iter_unpack(data: bytes) -> Iterator[Any]:
         >>> list(iter_unpack(packed))
         [1, 2, 3]
     """
+    data = _as_bytes(data)
     offset = 0
     while offset < len(data):
         if offset + 4 > len(data):
@@ -152,8 +320,7 @@ def iter_unpack(data: bytes) -> Iterator[Any]:
         if offset + length > len(data):
             raise ValueError("Unexpected end of data while reading object")
 
-        result, _ = _unpack_value(data, offset)
-        yield result
+        yield from _unpack_records(data, offset, length)
         offset += length
 
 
@@ -161,7 +328,10 @@ def pack_many(objects: Iterable[Any]) -> bytes:
     """
     Serialize multiple objects to a single bytes buffer.
 
-    Each object is prefixed with its length (4 bytes, big-endian).
+    Each record is prefixed with its length (4 bytes, big-endian). A run
+    of 16 or more dicts with the same str keys in the same order is
+    written as a single columnar record: the keys once, then one array
+    per key. iter_unpack and unpack_many expand it back into the dicts.
 
     Args:
         objects: An iterable of Python objects to serialize.
@@ -174,12 +344,22 @@ def pack_many(objects: Iterable[Any]) -> bytes:
         >>> list(typepack.iter_unpack(data))
         [{'id': 1}, {'id': 2}]
     """
+    items = list(objects)
     buffer = bytearray()
-    for obj in objects:
-        data = pack(obj)
-        # Write length prefix (4 bytes, big-endian)
-        buffer.extend(struct.pack(">I", len(data)))
-        buffer.extend(data)
+    start = 0
+    while start < len(items):
+        end = _table_run_end(items, start)
+        if end - start >= _TABLE_MIN_ROWS:
+            table = bytearray()
+            _pack_table(items[start:end], tuple(items[start]), table)
+            records = [table]
+        else:
+            records = [pack(obj) for obj in items[start:end]]
+        for data in records:
+            # Write length prefix (4 bytes, big-endian)
+            buffer.extend(struct.pack(">I", len(data)))
+            buffer.extend(data)
+        start = end
     return bytes(buffer)
 
 
@@ -200,4 +380,114 @@ def unpack_many(data: bytes) -> list[Any]:
         >>> typepack.unpack_many(data)
         [1, 2, 3]
     """
+    if _c_unpack_many is not None:
+        return _c_unpack_many(data, _unpack_record_objects)
     return list(iter_unpack(data))
+
+
+def _index_records(data: bytes) -> tuple[list[int], list[int], int]:
+    """Return each record's payload offset and first object index, and
+    the object count, reading only the length prefixes."""
+    if _c_index_many is not None:
+        return _c_index_many(data)
+
+    offsets = []
+    firsts = []
+    count = 0
+    offset = 0
+    while offset < len(data):
+        if offset + 4 > len(data):
+            raise ValueError("Unexpected end of data while reading length")
+        length = _STRUCT_UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        if offset + length > len(data):
+            raise ValueError("Unexpected end of data while reading object")
+
+        offsets.append(offset)
+        firsts.append(count)
+        if _is_table_record(data, offset, length):
+            count += _table_row_count(data, offset, length)
+        else:
+            count += 1
+        offset += length
+    return offsets, firsts, count
+
+
+def _unpack_table_record(data: bytes, offset: int, length: int) -> list[Any]:
+    """Decode the rows of one table block, preferring the C decoder."""
+    if _c_unpack_many is not None:
+        record = memoryview(data)[offset - 4:offset + length]
+        return _c_unpack_many(record, _unpack_record_objects)
+    rows, _ = _unpack_value(data, offset)
+    return rows
+
+
+class _LazyRecords(Sequence):
+    """Records of a pack_many buffer, decoded when they are accessed."""
+
+    def __init__(self, data: bytes):
+        self._data = _as_bytes(data)
+        self._offsets, self._firsts, self._count = _index_records(self._data)
+        # Decoded objects by record index, filled in as records are used
+        self._records: dict[int, list] = {}
+
+    def _objects(self, record: int) -> list:
+        """Return the objects of one record, decoding it on first use."""
+        objects = self._records.get(record)
+        if objects is None:
+            data = self._data
+            offset = self._offsets[record]
+            length = _STRUCT_UINT32.unpack_from(data, offset - 4)[0]
+            if _is_table_record(data, offset, length):
+                objects = _unpack_table_record(data, offset, length)
+            else:
+                objects = [_unpack_record(data, offset, length)]
+            self._records[record] = objects
+        return objects
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        index = operator.index(index)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+
+        record = bisect_right(self._firsts, index) - 1
+        return self._objects(record)[index - self._firsts[record]]
+
+    def __iter__(self) -> Iterator[Any]:
+        for record in range(len(self._offsets)):
+            yield from self._objects(record)
+
+
+def unpack_many_lazy(data: bytes) -> Sequence:
+    """
+    Index the records in a bytes buffer and decode them on access.
+
+    Reads only the length prefixes (and the row count of each table
+    block) up front, so indexing a buffer costs far less than decoding
+    it. The first access to a record decodes it (all rows at once for a
+    table block) and keeps the result, so like a list, every lookup or
+    iteration returns the same objects. Objects that have been accessed
+    take as much memory as they would in unpack_many's list.
+
+    Args:
+        data: Binary data written by pack_many or pack_stream.
+
+    Returns:
+        A read-only sequence of the deserialized objects.
+
+    Raises:
+        ValueError: If the record framing is invalid.
+
+    Example:
+        >>> records = typepack.unpack_many_lazy(typepack.pack_many([1, 2, 3]))
+        >>> len(records), records[-1]
+        (3, 3)
+    """
+    return _LazyRecords(data)